@@ -0,0 +1,12 @@
+"""Benchmarks for the ingestion and request paths. Run from backend/.
+
+    python -m bench.stages [--sizes 100,1000,10000,100000] [--out stages.json]
+    python -m bench.load [--jobs 5000] [--hit-ratios 1,0.8,0] [--out load.json]
+    python -m bench.lag [--jobs 10000] [--executors inline,thread,process] [--out lag.json]
+    python -m bench.compare baseline.json current.json [--threshold 1.25]
+    python -m bench.serialization [--out serialization.json]
+    python -m bench.fixtures          # record live upstream payloads
+
+Upstream payloads come from bench/fixtures/ (see bench.fixtures) and are
+served by a local stub (bench.stub), so no run touches the real APIs.
+"""
@@ -0,0 +1,69 @@
+"""Compare two benchmark result files and flag regressions.
+
+Run from backend/: python -m bench.compare baseline.json current.json --threshold 1.25
+
+Timings named by --metrics that are present in both files are compared
+(load phases are matched by hit ratio); sub-millisecond timings below
+--floor in both runs are too noisy to flag. Exits 1 if any got slower than
+``threshold`` times the baseline.
+"""
+import argparse
+import json
+import sys
+
+
+def _flatten(data, prefix: str = "") -> dict[str, float]:
+    out = {}
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if k != "meta":
+                out.update(_flatten(v, f"{prefix}{k}."))
+    elif isinstance(data, list):
+        for i, v in enumerate(data):
+            key = v.get("hitRatio", i) if isinstance(v, dict) else i
+            out.update(_flatten(v, f"{prefix}{key}."))
+    elif isinstance(data, (int, float)) and prefix.endswith("_ms."):
+        out[prefix[:-1]] = float(data)
+    return out
+
+
+def compare(
+    baseline: dict, current: dict, metrics: tuple[str, ...],
+) -> list[tuple[str, float, float, float]]:
+    """``(metric, baseline, current, ratio)`` for every chosen metric in both results."""
+    base, cur = _flatten(baseline), _flatten(current)
+    rows = []
+    for key in sorted(base.keys() & cur.keys()):
+        if not key.endswith(metrics):
+            continue
+        ratio = cur[key] / base[key] if base[key] else 1.0
+        rows.append((key, base[key], cur[key], ratio))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--metrics", default="min_ms,p50_ms,p90_ms")
+    parser.add_argument("--floor", type=float, default=0.5, help="ignore timings under this many ms")
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = 0
+    metrics = tuple(f".{m}" for m in args.metrics.split(","))
+    for key, b, c, ratio in compare(baseline, current, metrics):
+        flag = ""
+        if ratio > args.threshold and max(b, c) >= args.floor:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:<50} {b:>10.3f} {c:>10.3f} {ratio:>6.2f}x{flag}")
+    print(f"{regressions} regression(s) over {args.threshold:.2f}x")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
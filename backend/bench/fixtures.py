@@ -0,0 +1,71 @@
+"""Upstream payloads replayed by the benchmarks.
+
+Recorded payloads in bench/fixtures/ are used when present; otherwise
+bench.synthetic stands in. Record once (needs network) with:
+
+    python -m bench.fixtures
+"""
+import asyncio
+import json
+from pathlib import Path
+
+from bench.synthetic import remotive_records, arbeitnow_records
+from config import REMOTIVE_URL, ARBEITNOW_URL, CATEGORIES
+from services.http_client import HttpClient
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+_SYNTHETIC = {"remotive": remotive_records, "arbeitnow": arbeitnow_records}
+
+
+def load_records(source: str) -> list[dict] | None:
+    path = FIXTURE_DIR / f"{source}.json"
+    if path.exists():
+        return json.loads(path.read_text())
+    return None
+
+
+def scaled(source: str, n: int) -> list[dict]:
+    """``n`` raw records, repeating a recording with fresh ids when it is shorter."""
+    base = load_records(source)
+    if not base:
+        return _SYNTHETIC[source](n)
+    out = []
+    for i in range(n):
+        r = dict(base[i % len(base)])
+        if i >= len(base):
+            if source == "remotive":
+                r["id"] = f"{r['id']}-{i}"
+            else:
+                r["slug"] = f"{r['slug']}-{i}"
+        out.append(r)
+    return out
+
+
+async def record() -> None:
+    http = HttpClient()
+    await http.start()
+    try:
+        remotive = []
+        for c in CATEGORIES:
+            status, data = await http.get_json(REMOTIVE_URL, {"category": c["id"]})
+            if status == 200:
+                remotive.extend(data.get("jobs") or [])
+        arbeitnow, url = [], ARBEITNOW_URL
+        for _ in range(10):
+            status, data = await http.get_json(url)
+            if status != 200:
+                break
+            arbeitnow.extend(data.get("data") or [])
+            url = (data.get("links") or {}).get("next")
+            if not url:
+                break
+    finally:
+        await http.close()
+    FIXTURE_DIR.mkdir(exist_ok=True)
+    for source, records in (("remotive", remotive), ("arbeitnow", arbeitnow)):
+        (FIXTURE_DIR / f"{source}.json").write_text(json.dumps(records))
+        print(f"{source}: {len(records)} records")
+
+
+if __name__ == "__main__":
+    asyncio.run(record())
@@ -0,0 +1,81 @@
+"""Timing and result helpers shared by the benchmarks."""
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+
+def measure(fn: Callable[[], Any], min_time: float = 0.3, max_runs: int = 20) -> dict:
+    """Run ``fn`` until ``min_time`` seconds or ``max_runs`` runs have passed."""
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_runs and (not times or time.perf_counter() - start < min_time):
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000)
+    return _summary(times)
+
+
+async def ameasure(fn: Callable[[], Any], min_time: float = 0.3, max_runs: int = 20) -> dict:
+    """``measure`` for a coroutine function."""
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_runs and (not times or time.perf_counter() - start < min_time):
+        t = time.perf_counter()
+        await fn()
+        times.append((time.perf_counter() - t) * 1000)
+    return _summary(times)
+
+
+def _summary(times: list[float]) -> dict:
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "runs": len(times),
+    }
+
+
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": pct(0.50),
+        "p90_ms": pct(0.90),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def meta() -> dict:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        rev = ""
+    return {
+        "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": rev,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+
+
+def emit(results: dict, out: str | None) -> None:
+    """Print ``results`` as JSON and write them to ``out`` if given."""
+    body = json.dumps(results, indent=2)
+    print(body)
+    if out:
+        with open(out, "w") as f:
+            f.write(body + "\n")
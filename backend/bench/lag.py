@@ -0,0 +1,115 @@
+"""Event-loop lag while the ingestion worker refreshes a large corpus.
+
+Run from backend/: python -m bench.lag --jobs 10000 --executors inline,thread,process --out lag.json
+
+For each executor a fresh worker ingests the stub's corpus cold, then again
+with every record edited (so everything is remapped and rebuilt), while the
+loop is sampled every few milliseconds. Lag is how late a sleeping task was
+resumed, i.e. how long any request arriving at that moment would have
+waited. The last phase checks that a small corpus stays inline.
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from bench.fixtures import scaled
+from bench.harness import percentiles, meta, emit
+from bench.stub import StubUpstream
+import services.remotive
+from config import ARBEITNOW_MAX_PAGES
+from services.crawler import Crawler
+from services.executor import offload
+from services.http_client import client
+from services.ingestion import IngestionWorker
+from services.metrics import LoopLagMonitor
+
+
+class _StubThread:
+    """Runs a stub on its own loop, so its JSON encoding isn't counted as lag."""
+
+    def __init__(self, stub: StubUpstream):
+        self.stub = stub
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def __enter__(self) -> StubUpstream:
+        self._thread.start()
+        self._call(self.stub.start())
+        self.stub.install()
+        return self.stub
+
+    def __exit__(self, *exc) -> None:
+        self._call(self.stub.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+def _worker() -> IngestionWorker:
+    worker = IngestionWorker(snapshot_path=None)
+    # Only the CPU work is of interest here, not politeness towards upstreams
+    worker.crawler = Crawler(client, {name: 1000.0 for name in worker.status})
+    return worker
+
+
+async def _refresh(worker: IngestionWorker, interval: float) -> dict:
+    for status in worker.status.values():
+        status.last_success = None
+    monitor = LoopLagMonitor(interval)
+    monitor.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker.refresh(name) for name in worker.status))
+    elapsed = time.perf_counter() - start
+    await monitor.stop()
+    return {
+        "refreshMs": round(elapsed * 1000, 1),
+        "postings": len(worker.snapshot.store),
+        "lag": percentiles([s * 1000 for s in monitor.samples]),
+    }
+
+
+def _edit(stub: StubUpstream) -> None:
+    for jobs in stub.remotive.values():
+        jobs[:] = [{**r, "description": r["description"] + " "} for r in jobs]
+    stub.arbeitnow = [{**r, "description": r["description"] + " "} for r in stub.arbeitnow]
+
+
+async def main(args) -> dict:
+    arbeitnow = scaled("arbeitnow", args.jobs // 4)
+    # Serve everything within the crawl's page and per-category limits
+    stub = StubUpstream(
+        scaled("remotive", args.jobs), arbeitnow, page_size=-(-len(arbeitnow) // ARBEITNOW_MAX_PAGES),
+    )
+    services.remotive.REMOTIVE_LIMIT = args.jobs
+    await client.start()
+    results = {"meta": meta(), "jobs": args.jobs, "executors": {}}
+    try:
+        with _StubThread(stub):
+            for kind in args.executors:
+                offload.kind = kind
+                # Start the pool outside the measured phases
+                await offload.map(int, ["1"] * offload.workers * offload.chunk, 0)
+                worker = _worker()
+                runs = {"cold": await _refresh(worker, args.interval)}
+                _edit(stub)
+                runs["edited"] = await _refresh(worker, args.interval)
+                results["executors"][kind] = runs
+        with _StubThread(StubUpstream(scaled("remotive", 50), scaled("arbeitnow", 20))):
+            results["small"] = await _refresh(_worker(), args.interval)
+    finally:
+        offload.shutdown()
+        await client.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10000, help="Remotive postings served by the stub")
+    parser.add_argument("--executors", default="inline,thread,process", type=lambda s: s.split(","))
+    parser.add_argument("--interval", type=float, default=0.005, help="lag sampling interval, seconds")
+    parser.add_argument("--out")
+    args = parser.parse_args()
+    emit(asyncio.run(main(args)), args.out)
@@ -0,0 +1,170 @@
+"""End-to-end load test of POST /api/jobs with a mix of cache hits and misses.
+
+Run from backend/: python -m bench.load --jobs 5000 --hit-ratios 1,0.8,0 --out load.json
+
+By default it starts the stub upstream and a uvicorn server pointed at it,
+waits for the first ingestion, then runs one phase per hit ratio. A hit
+repeats one of a few warmed requests; a miss is a query and category
+combination not sent before. Pass --url to load an already running server
+instead (it keeps whatever upstreams it was started with).
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+from bench.fixtures import scaled
+from bench.harness import percentiles, meta, emit
+from bench.stub import StubUpstream
+from config import CATEGORIES
+
+WORDS = [
+    "engineer", "designer", "product", "data", "react", "python", "senior", "support",
+    "marketing", "analyst", "manager", "sales", "aws", "docker",
+]
+SKILLS = ["react", "python", "figma", "aws"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _miss_payloads(seed: int = 0):
+    """Endless stream of request bodies that never repeat a cache key."""
+    rng = random.Random(seed)
+    cat_ids = [c["id"] for c in CATEGORIES]
+    combos = list(itertools.product(WORDS, range(1, 2 ** len(cat_ids))))
+    rng.shuffle(combos)
+    for word, bits in combos:
+        cats = [c for i, c in enumerate(cat_ids) if bits >> i & 1]
+        yield {"query": word, "categories": cats, "skills": SKILLS, "limit": 25}
+
+
+HOT = [{"query": w, "categories": [], "skills": SKILLS, "limit": 25} for w in WORDS[:8]]
+
+
+async def _wait_ready(session: aiohttp.ClientSession, url: str, timeout: float = 120) -> int:
+    """Wait for every source's first ingest; return the postings ingested."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(f"{url}/api/ingestion") as resp:
+                status = await resp.json()
+            if all(s["lastSuccess"] for s in status["sources"].values()):
+                return sum(s["jobs"] for s in status["sources"].values())
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.5)
+    raise TimeoutError("server did not finish ingesting")
+
+
+async def _phase(
+    session: aiohttp.ClientSession, url: str, hit_ratio: float, requests: int,
+    concurrency: int, misses, rng: random.Random,
+) -> dict:
+    kinds = ["hit" if rng.random() < hit_ratio else "miss" for _ in range(requests)]
+    latencies: dict[str, list[float]] = {"hit": [], "miss": []}
+    errors = 0
+    sent = 0
+    queue = iter(kinds)
+
+    async def client():
+        nonlocal errors, sent
+        for kind in queue:
+            body = rng.choice(HOT) if kind == "hit" else next(misses)
+            t = time.perf_counter()
+            try:
+                async with session.post(f"{url}/api/jobs", json=body) as resp:
+                    data = await resp.read()
+                    ok = resp.status == 200
+            except aiohttp.ClientError:
+                ok = False
+            if ok:
+                latencies[kind].append((time.perf_counter() - t) * 1000)
+                sent += len(data)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "hitRatio": hit_ratio,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "bytes": sent,
+        "all": percentiles(latencies["hit"] + latencies["miss"]),
+        "hit": percentiles(latencies["hit"]),
+        "miss": percentiles(latencies["miss"]),
+    }
+
+
+async def main(args) -> dict:
+    stub = server = None
+    url = args.url
+    if url is None:
+        arbeitnow = scaled("arbeitnow", args.jobs // 4)
+        stub = StubUpstream(scaled("remotive", args.jobs), arbeitnow)
+        await stub.start()
+        port = _free_port()
+        env = {
+            **os.environ,
+            "REMOTIVE_LIMIT": str(args.jobs),
+            "ARBEITNOW_MAX_PAGES": str(max(1, -(-len(arbeitnow) // stub.page_size))),
+            "REMOTIVE_URL": stub.remotive_url,
+            "ARBEITNOW_URL": stub.arbeitnow_url,
+            "SNAPSHOT_PATH": os.path.join(tempfile.mkdtemp(), "jobs.snapshot"),
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            env=env,
+        )
+        url = f"http://127.0.0.1:{port}"
+    results = {"meta": meta(), "jobs": args.jobs if args.url is None else None, "phases": []}
+    try:
+        connector = aiohttp.TCPConnector(limit=args.concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results["ingested"] = await _wait_ready(session, url)
+            for body in HOT:
+                async with session.post(f"{url}/api/jobs", json=body) as resp:
+                    await resp.read()
+            misses = _miss_payloads()
+            rng = random.Random(1)
+            for ratio in args.hit_ratios:
+                results["phases"].append(await _phase(
+                    session, url, ratio, args.requests, args.concurrency, misses, rng,
+                ))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if stub is not None:
+            await stub.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="load an already running server instead of starting one")
+    parser.add_argument("--jobs", type=int, default=5000, help="Remotive postings served by the stub")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per phase")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--hit-ratios", default="1,0.8,0.5,0",
+        type=lambda s: [float(x) for x in s.split(",")],
+    )
+    parser.add_argument("--out")
+    args = parser.parse_args()
+    emit(asyncio.run(main(args)), args.out)
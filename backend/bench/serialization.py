@@ -0,0 +1,79 @@
+"""Per-1,000-job cost of building the POST /api/jobs response body.
+
+Run from backend/: python -m bench.serialization [--out serialization.json]
+"""
+import argparse
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from bench.harness import meta, emit
+from bench.synthetic import remotive_records
+from models import JobDetail
+from services.remotive import map_remotive
+from services.scoring import get_matcher
+from services.serialization import (
+    validate_posting, summary_prefix, encode_summary, encode_jobs_response,
+)
+
+N = 1000
+ROUNDS = 20
+
+
+class LegacyJob(JobDetail):
+    match: int
+    userSkillMatch: list[str]
+
+
+class LegacyResponse(BaseModel):
+    jobs: list[LegacyJob]
+    total: int
+    cached: bool
+
+
+def _scored(postings: list[dict]) -> list[dict]:
+    matcher = get_matcher(["react", "python", "design"])
+    return [
+        {**p, "match": 80, "userSkillMatch": matcher.matched(p["tags"])[:6]}
+        for p in postings
+    ]
+
+
+def legacy(jobs: list[dict]) -> bytes:
+    # Old handler: Job(**j) per job, then FastAPI validates the response model
+    # again, runs jsonable_encoder and json.dumps
+    resp = LegacyResponse(jobs=[LegacyJob(**j) for j in jobs], total=len(jobs), cached=True)
+    validated = LegacyResponse.model_validate(resp.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast(jobs: list[dict], prefixes: list[bytes] | None = None) -> bytes:
+    if prefixes is None:
+        prefixes = [summary_prefix(j) for j in jobs]
+    fragments = (
+        encode_summary(p, j["match"], j["userSkillMatch"], j["postedDays"]) for p, j in zip(prefixes, jobs)
+    )
+    return encode_jobs_response(fragments, len(jobs), True, None)
+
+
+def main() -> dict:
+    jobs = _scored([validate_posting(map_remotive(r)) for r in remotive_records(N)])
+    prefixes = [summary_prefix(j) for j in jobs]
+    return {
+        "meta": meta(),
+        "jobs": N,
+        "legacy_ms": timeit.timeit(lambda: legacy(jobs), number=ROUNDS) / ROUNDS * 1000,
+        "fast_cold_ms": timeit.timeit(lambda: fast(jobs), number=ROUNDS) / ROUNDS * 1000,
+        "fast_warm_ms": timeit.timeit(lambda: fast(jobs, prefixes), number=ROUNDS) / ROUNDS * 1000,
+        "legacy_bytes": len(legacy(jobs)),
+        "fast_bytes": len(fast(jobs, prefixes)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out")
+    args = parser.parse_args()
+    emit(main(), args.out)
@@ -0,0 +1,121 @@
+"""Per-stage cost of ingestion and of serving POST /api/jobs at several corpus sizes.
+
+Run from backend/: python -m bench.stages --sizes 100,1000,10000 --out stages.json
+
+Stages: fetch (HTTP + JSON decode of Arbeitnow pages from the stub), map
+(map + validate + hash, cold) and remap (same records, all unchanged),
+store and index builds, dedup, filter, score (rank one page), serialize
+(encode one page, cold prefixes) and the whole request path on a cache
+miss and a cache hit.
+"""
+import argparse
+import asyncio
+import math
+import time
+
+import numpy as np
+
+from bench.fixtures import scaled
+from bench.harness import measure, ameasure, meta, emit
+from bench.stub import StubUpstream
+from config import MAX_PAGE_SIZE
+from services import aggregator
+from services.arbeitnow import fetch_arbeitnow
+from services.dedup import find_duplicates
+from services.http_client import HttpClient
+from services.ingestion import DeltaMapper, worker
+from services.locations import region_mask
+from services.remotive import map_remotive, remotive_id
+from services.scoring import get_matcher
+from services.search import SearchIndex
+from services.serialization import encode_jobs_response
+from services.store import JobStore
+
+SKILLS = ["react", "python", "figma", "aws"]
+FILTERS = {"minSalary": 0, "jobTypes": ["full_time"], "recent": True}
+
+
+async def _unmapped(records: list[dict]) -> list[dict]:
+    return records
+
+
+async def run_size(n: int, stub: StubUpstream, http: HttpClient) -> dict:
+    stages = {}
+    records = scaled("remotive", n)
+    pages = math.ceil(n / stub.page_size)
+    stub.arbeitnow = scaled("arbeitnow", n)
+    stages["fetch"] = await ameasure(
+        lambda: fetch_arbeitnow(http, mapper=_unmapped, max_pages=pages), max_runs=5,
+    )
+
+    def cold_map():
+        mapper = DeltaMapper(map_remotive, remotive_id, {})
+        return [p for p in map(mapper, records) if p is not None]
+
+    stages["map"] = measure(cold_map, max_runs=5)
+    postings = cold_map()
+    known = {p["id"]: p for p in postings}
+    stages["remap"] = measure(
+        lambda: list(map(DeltaMapper(map_remotive, remotive_id, known), records)), max_runs=5,
+    )
+    stages["store"] = measure(lambda: JobStore(postings), max_runs=3)
+    stages["index"] = measure(lambda: SearchIndex(postings), max_runs=3)
+    store = JobStore(postings)
+    rows = np.arange(len(postings))
+    stages["dedup"] = measure(lambda: find_duplicates(postings).unique(rows), max_runs=3)
+    us = region_mask(None)
+    stages["filter"] = measure(lambda: store.filter(store.in_regions(rows, us), FILTERS))
+
+    matcher = get_matcher(SKILLS)
+    stages["score"] = measure(lambda: store.rank(rows, matcher, {}, limit=MAX_PAGE_SIZE))
+    ranking = store.rank(rows, matcher, {}, limit=MAX_PAGE_SIZE)
+
+    def serialize():
+        for r in ranking.rows.tolist():
+            store._prefixes[r] = None
+        return encode_jobs_response(ranking.encoded(), ranking.total, False, None)
+
+    stages["serialize"] = measure(serialize)
+
+    # Whole request path over a published snapshot of this corpus
+    worker._feeds = {"remotive:bench": tuple(postings)}
+    worker._layout = []
+    worker._publish()
+    for s in worker.status.values():
+        s.last_success = time.time()
+
+    async def request(clear: bool):
+        if clear:
+            aggregator._cache.clear()
+        page = await aggregator.fetch_all_jobs("engineer", [], SKILLS, {}, limit=25)
+        encode_jobs_response(page.encoded(), page.total, page.cached, page.next_cursor)
+
+    stages["request_miss"] = await ameasure(lambda: request(True))
+    stages["request_hit"] = await ameasure(lambda: request(False))
+    return stages
+
+
+async def main(sizes: list[int]) -> dict:
+    worker.snapshot_path = None
+    stub = StubUpstream([], [])
+    await stub.start()
+    stub.install()
+    http = HttpClient()
+    await http.start()
+    results = {"meta": meta(), "sizes": {}}
+    try:
+        for n in sizes:
+            results["sizes"][str(n)] = await run_size(n, stub, http)
+    finally:
+        await http.close()
+        await stub.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000,100000")
+    parser.add_argument("--out")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    emit(asyncio.run(main(sizes)), args.out)
@@ -0,0 +1,69 @@
+"""Local stand-in for the Remotive and Arbeitnow APIs."""
+from aiohttp import web
+
+import services.arbeitnow
+import services.remotive
+from config import CATEGORIES
+
+
+class StubUpstream:
+    """Serves raw records the way the real APIs do.
+
+    Remotive records are spread over the categories and honour ``limit``;
+    Arbeitnow is paged ``page_size`` at a time with ``links.next``.
+    """
+
+    def __init__(self, remotive: list[dict], arbeitnow: list[dict], page_size: int = 100):
+        cat_ids = [c["id"] for c in CATEGORIES]
+        self.remotive = {c: remotive[i::len(cat_ids)] for i, c in enumerate(cat_ids)}
+        self.arbeitnow = arbeitnow
+        self.page_size = page_size
+        self.hits = 0
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    @property
+    def remotive_url(self) -> str:
+        return f"{self.base_url}/remotive"
+
+    @property
+    def arbeitnow_url(self) -> str:
+        return f"{self.base_url}/arbeitnow"
+
+    async def _remotive(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        jobs = self.remotive.get(request.query.get("category", ""), [])
+        limit = int(request.query.get("limit", len(jobs)))
+        return web.json_response({"jobs": jobs[:limit]})
+
+    async def _arbeitnow(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        page = int(request.query.get("page", 1))
+        start = (page - 1) * self.page_size
+        data = self.arbeitnow[start:start + self.page_size]
+        more = start + self.page_size < len(self.arbeitnow)
+        return web.json_response({
+            "data": data,
+            "links": {"next": f"{self.arbeitnow_url}?page={page + 1}" if more else None},
+        })
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.add_routes([web.get("/remotive", self._remotive), web.get("/arbeitnow", self._arbeitnow)])
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def install(self) -> None:
+        """Point this process's source fetchers at the stub."""
+        services.remotive.REMOTIVE_URL = self.remotive_url
+        services.arbeitnow.ARBEITNOW_URL = self.arbeitnow_url
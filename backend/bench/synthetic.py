@@ -0,0 +1,55 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from config import CATEGORIES
+
+_TAGS = [
+    "react", "python", "figma", "node.js", "aws", "docker", "sql", "go", "rust",
+    "product management", "ux research", "sales", "seo", "kubernetes", "typescript",
+]
+_LOCATIONS = ["USA", "Worldwide", "Europe", "New York, NY", "Austin, TX", "Berlin", "Canada"]
+_TITLES = ["Engineer", "Designer", "Product Manager", "Data Analyst", "Marketer", "Support Specialist"]
+
+
+def remotive_records(n: int, seed: int = 0) -> list[dict]:
+    """Raw Remotive-shaped postings with realistic field sizes."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": 100000 + i,
+            "title": f"{rng.choice(['Senior', 'Staff', 'Lead', ''])} {rng.choice(_TITLES)} [{rng.choice(['US', 'Remote'])}]",
+            "company_name": f"Company {rng.randint(1, n // 4 + 1)}",
+            "company_logo": "",
+            "candidate_required_location": rng.choice(_LOCATIONS),
+            "salary": rng.choice(["", "$90,000 - $120,000", "$140k-$180k"]),
+            "publication_date": (now - timedelta(days=rng.randint(0, 40))).isoformat(),
+            "description": "<p>" + " ".join(rng.choices(_TAGS + _TITLES, k=400)) + "</p>",
+            "tags": rng.sample(_TAGS, rng.randint(0, 8)),
+            "url": f"https://remotive.com/remote-jobs/{i}",
+            "job_type": rng.choice(["full_time", "contract", "part_time"]),
+            "category": rng.choice(CATEGORIES)["label"],
+        }
+        for i in range(n)
+    ]
+
+
+def arbeitnow_records(n: int, seed: int = 0) -> list[dict]:
+    """Raw Arbeitnow-shaped postings."""
+    rng = random.Random(seed)
+    now = int(datetime.now(timezone.utc).timestamp())
+    return [
+        {
+            "slug": f"synthetic-{i}",
+            "company_name": f"Firma {rng.randint(1, n // 4 + 1)} GmbH",
+            "title": f"{rng.choice(['Senior', 'Junior', ''])} {rng.choice(_TITLES)} (m/w/d)",
+            "description": "<p>" + " ".join(rng.choices(_TAGS + _TITLES, k=300)) + "</p>",
+            "remote": rng.random() < 0.4,
+            "url": f"https://www.arbeitnow.com/view/synthetic-{i}",
+            "tags": rng.sample(_TAGS, rng.randint(0, 5)),
+            "job_types": [rng.choice(["Full-time", "Part-time", "Internship"])],
+            "location": rng.choice(["Berlin", "Munich", "Hamburg", "Remote", "Austin, TX"]),
+            "created_at": now - rng.randint(0, 40) * 86400,
+        }
+        for i in range(n)
+    ]
@@ -1,8 +1,24 @@
-REMOTIVE_URL = "https://remotive.com/api/remote-jobs"
-ARBEITNOW_URL = "https://www.arbeitnow.com/api/job-board-api"
-REMOTIVE_LIMIT = 100
-ARBEITNOW_LIMIT = 50
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Read backend/.env first; variables already set in the environment win
+load_dotenv(Path(__file__).with_name(".env"))
+
+REMOTIVE_URL = os.getenv("REMOTIVE_URL", "https://remotive.com/api/remote-jobs")
+ARBEITNOW_URL = os.getenv("ARBEITNOW_URL", "https://www.arbeitnow.com/api/job-board-api")
+REMOTIVE_LIMIT = int(os.getenv("REMOTIVE_LIMIT", "100"))
 CACHE_TTL_SECONDS = 300
+CACHE_MAX_ENTRIES = 512
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Cache/state backend shared across workers; empty REDIS_URL keeps it in-process
+REDIS_URL = os.getenv("REDIS_URL", "")
+BACKEND_KEY_PREFIX = "matchpoint:"
+STATE_CACHE_MAX_ENTRIES = 10_000
+STATE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+OAUTH_STATE_TTL_SECONDS = 600
 
 CATEGORIES = [
     {"id": "software-dev", "label": "Software Dev", "icon": "fa-code"},
@@ -52,4 +68,146 @@ US_CITIES = {
     "cleveland","cincinnati","st louis","st. louis",
 }
 
-WORLDWIDE_TERMS = {"worldwide","anywhere","global","remote","usa or","us or","north america"}
+# Words marking a worldwide or a remote role (remote naming no place is worldwide)
+WORLDWIDE_TERMS = {"worldwide","anywhere","global","international"}
+REMOTE_TERMS = {"remote","distributed","work from home","wfh","home office"}
+
+REGIONS = [
+    {"id": "us", "label": "United States", "icon": "fa-flag-usa"},
+    {"id": "canada", "label": "Canada", "icon": "fa-leaf"},
+    {"id": "latam", "label": "Latin America", "icon": "fa-earth-americas"},
+    {"id": "europe", "label": "Europe", "icon": "fa-earth-europe"},
+    {"id": "apac", "label": "Asia-Pacific", "icon": "fa-earth-asia"},
+    {"id": "mea", "label": "Middle East & Africa", "icon": "fa-earth-africa"},
+]
+
+# Place names -> (country code, region ids), besides US_CITIES / US_STATES
+LOCATION_TERMS = {
+    "united states": ("US", ["us"]), "usa": ("US", ["us"]), "us": ("US", ["us"]),
+    "u.s.": ("US", ["us"]), "america": ("US", ["us"]),
+    "north america": ("", ["us", "canada"]), "americas": ("", ["us", "canada", "latam"]),
+    "canada": ("CA", ["canada"]), "toronto": ("CA", ["canada"]),
+    "vancouver": ("CA", ["canada"]), "montreal": ("CA", ["canada"]),
+    "latam": ("", ["latam"]), "latin america": ("", ["latam"]), "central america": ("", ["latam"]),
+    "south america": ("", ["latam"]), "mexico": ("MX", ["latam"]),
+    "brazil": ("BR", ["latam"]), "argentina": ("AR", ["latam"]),
+    "colombia": ("CO", ["latam"]), "chile": ("CL", ["latam"]), "peru": ("PE", ["latam"]),
+    "europe": ("", ["europe"]), "eu": ("", ["europe"]), "emea": ("", ["europe", "mea"]),
+    "uk": ("GB", ["europe"]), "united kingdom": ("GB", ["europe"]),
+    "england": ("GB", ["europe"]), "london": ("GB", ["europe"]),
+    "germany": ("DE", ["europe"]), "deutschland": ("DE", ["europe"]),
+    "berlin": ("DE", ["europe"]), "munich": ("DE", ["europe"]), "münchen": ("DE", ["europe"]),
+    "hamburg": ("DE", ["europe"]), "frankfurt": ("DE", ["europe"]),
+    "cologne": ("DE", ["europe"]), "köln": ("DE", ["europe"]),
+    "stuttgart": ("DE", ["europe"]), "düsseldorf": ("DE", ["europe"]),
+    "france": ("FR", ["europe"]), "paris": ("FR", ["europe"]),
+    "netherlands": ("NL", ["europe"]), "amsterdam": ("NL", ["europe"]),
+    "spain": ("ES", ["europe"]), "madrid": ("ES", ["europe"]), "barcelona": ("ES", ["europe"]),
+    "portugal": ("PT", ["europe"]), "lisbon": ("PT", ["europe"]),
+    "ireland": ("IE", ["europe"]), "dublin": ("IE", ["europe"]),
+    "switzerland": ("CH", ["europe"]), "zurich": ("CH", ["europe"]),
+    "austria": ("AT", ["europe"]), "vienna": ("AT", ["europe"]),
+    "poland": ("PL", ["europe"]), "italy": ("IT", ["europe"]), "sweden": ("SE", ["europe"]),
+    "belgium": ("BE", ["europe"]), "denmark": ("DK", ["europe"]), "norway": ("NO", ["europe"]),
+    "finland": ("FI", ["europe"]), "czechia": ("CZ", ["europe"]), "romania": ("RO", ["europe"]),
+    "ukraine": ("UA", ["europe"]),
+    "apac": ("", ["apac"]), "asia": ("", ["apac"]), "india": ("IN", ["apac"]),
+    "bangalore": ("IN", ["apac"]), "bengaluru": ("IN", ["apac"]), "mumbai": ("IN", ["apac"]),
+    "delhi": ("IN", ["apac"]), "hyderabad": ("IN", ["apac"]), "pune": ("IN", ["apac"]),
+    "singapore": ("SG", ["apac"]), "japan": ("JP", ["apac"]), "china": ("CN", ["apac"]),
+    "hong kong": ("HK", ["apac"]), "korea": ("KR", ["apac"]), "vietnam": ("VN", ["apac"]),
+    "indonesia": ("ID", ["apac"]), "philippines": ("PH", ["apac"]),
+    "australia": ("AU", ["apac"]), "new zealand": ("NZ", ["apac"]),
+    "africa": ("", ["mea"]), "middle east": ("", ["mea"]), "israel": ("IL", ["mea"]),
+    "uae": ("AE", ["mea"]), "dubai": ("AE", ["mea"]), "egypt": ("EG", ["mea"]),
+    "nigeria": ("NG", ["mea"]), "south africa": ("ZA", ["mea"]), "kenya": ("KE", ["mea"]),
+    "turkey": ("TR", ["mea"]), "saudi arabia": ("SA", ["mea"]),
+}
+
+# Seconds between refreshes per source, and before retrying a failed one
+REFRESH_INTERVALS = {"remotive": 300, "arbeitnow": 300}
+REFRESH_DEFAULT_SECONDS = 300
+REFRESH_RETRY_SECONDS = 30
+INGEST_WARMUP_SECONDS = 10
+# On-disk copy of the corpus for warm starts, shared by workers on one host
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "data/jobs.snapshot")
+# Crawler: requests in flight, requests per second per source, retries
+CRAWL_CONCURRENCY = 4
+CRAWL_RATE_LIMITS = {"remotive": 2.0, "arbeitnow": 2.0}
+CRAWL_DEFAULT_RATE = 1.0
+CRAWL_RETRIES = 3
+CRAWL_BACKOFF_BASE = 0.5
+CRAWL_BACKOFF_MAX = 10
+# Incremental crawls stop at a page with nothing new; full ones find removals
+ARBEITNOW_MAX_PAGES = int(os.getenv("ARBEITNOW_MAX_PAGES", "10"))
+CRAWL_FULL_SECONDS = 3600
+# Time a source gets per crawl; whatever it fetched by then is kept
+SOURCE_TIMEOUT_SECONDS = 20
+# Consecutive failed or overtime crawls before a source is skipped, and for how long
+BREAKER_FAILURES = 3
+BREAKER_COOLDOWN_SECONDS = 300
+# How long a request may wait on a cold corpus before serving fallback jobs
+REQUEST_BUDGET_SECONDS = 2.0
+# Older snapshots kept around so pagination cursors stay on a stable corpus
+SNAPSHOT_HISTORY = 3
+
+# POST /api/jobs pagination
+MAX_PAGE_SIZE = 100
+# POST /api/jobs/stream sends this many jobs per chunk
+STREAM_BATCH_JOBS = 100
+# Skills shown per job in list responses; details carry the full list
+SUMMARY_SKILLS = 4
+
+# Match score weights (summing to 1), recency half-life and untagged skill score
+RANK_SKILL_WEIGHT = 0.7
+RANK_RECENCY_WEIGHT = 0.2
+RANK_SALARY_WEIGHT = 0.1
+RANK_RECENCY_HALF_LIFE_DAYS = 14
+RANK_UNTAGGED_SKILL = 0.25
+RANK_CACHED_SKILL_SETS = 32
+
+# Shared upstream HTTP client
+HTTP_LIMIT = 100
+HTTP_LIMIT_PER_HOST = 8
+HTTP_DNS_TTL_SECONDS = 300
+HTTP_KEEPALIVE_SECONDS = 30
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 20
+HTTP_TOTAL_TIMEOUT = 30
+# Upstream listings are parsed as they download, this many bytes at a time
+HTTP_STREAM_CHUNK_BYTES = 64 * 1024
+
+# Near-duplicate detection: MinHash slots, LSH bands and match thresholds
+DEDUP_NUM_PERM = 32
+DEDUP_BANDS = 8
+DEDUP_THRESHOLD = 0.8
+DEDUP_TITLE_OVERLAP = 0.5
+DEDUP_TEXT_CHARS = 2000
+
+# Prometheus metrics at /api/metrics and per-stage Server-Timing headers, both
+# off by default since they reveal internals to anyone who can reach the API
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0") == "1"
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+# Pool for CPU-bound batches: "thread", "process" or "inline" (record mapping only)
+OFFLOAD_EXECUTOR = os.getenv("OFFLOAD_EXECUTOR", "thread")
+OFFLOAD_WORKERS = int(os.getenv("OFFLOAD_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Small, since each busy thread holds the GIL away from the event loop
+OFFLOAD_THREADS = int(os.getenv("OFFLOAD_THREADS", "2"))
+# Smallest batch worth handing over, per kind of work
+OFFLOAD_MIN_RECORDS = 16
+OFFLOAD_MIN_POSTINGS = 1000
+OFFLOAD_MIN_ROWS = 20000
+# Records per pool task, so a process pool pickles a few large messages
+OFFLOAD_CHUNK_RECORDS = 64
+# How often event-loop lag is sampled
+LOOP_LAG_INTERVAL_SECONDS = 0.25
+
+# Local full-text search over the ingested corpus
+SEARCH_FIELD_WEIGHTS = {"title": 3.0, "company": 2.0, "tags": 2.0, "description": 1.0}
+SEARCH_PREFIX_EXPANSIONS = 50
+# Share of the ranking key taken by query relevance (the rest is match score)
+SEARCH_BLEND = 0.4
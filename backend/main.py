@@ -1,20 +1,30 @@
 import os
 import base64
+import hashlib
+import itertools
 import json
 import secrets
 import urllib.parse
+from contextlib import asynccontextmanager
 
-import aiohttp
-from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 
-from config import CATEGORIES, JOB_TYPES
-from models import JobsRequest, JobsResponse, Job
-from services.aggregator import fetch_all_jobs
-
-load_dotenv()
+from config import (
+    CATEGORIES, JOB_TYPES, REGIONS, INGEST_WARMUP_SECONDS, OAUTH_STATE_TTL_SECONDS,
+    METRICS_ENABLED, SERVER_TIMING, STREAM_BATCH_JOBS,
+)
+from models import JobsRequest, JobsResponse, JobDetail
+from services.aggregator import JobsPage, fetch_all_jobs, get_job, cache_stats
+from services.pagination import InvalidCursor
+from services.serialization import encode_detail, encode_jobs_response
+from utils import posted_days
+from services.ingestion import worker
+from services.http_client import client as http_client
+from services.backends import backend
+from services.executor import offload
+from services.metrics import MetricsMiddleware, loop_lag, registry, stage
 
 LINKEDIN_CLIENT_ID = os.getenv("LINKEDIN_CLIENT_ID", "")
 LINKEDIN_CLIENT_SECRET = os.getenv("LINKEDIN_CLIENT_SECRET", "")
@@ -28,12 +38,28 @@ ALLOWED_ORIGINS = os.getenv(
     "http://localhost:5173,http://localhost:3000,http://127.0.0.1:5173"
 ).split(",")
 
-# In-memory state store (fine for single-process dev; use Redis in production)
-_oauth_states = set()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Give the first snapshot a bounded head start so early requests are
+    # served real jobs; after that, refreshes happen in the background.
+    await http_client.start()
+    if METRICS_ENABLED:
+        loop_lag.start()
+    worker.start()
+    await worker.wait_ready(INGEST_WARMUP_SECONDS)
+    yield
+    await worker.stop()
+    await loop_lag.stop()
+    offload.shutdown()
+    await http_client.close()
+    await backend.close()
+
 
 app = FastAPI(
     title="MatchPoint API",
     version="1.0.0",
+    lifespan=lifespan,
     docs_url="/docs" if ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if ENVIRONMENT == "development" else None,
 )
@@ -46,6 +72,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if METRICS_ENABLED or SERVER_TIMING:
+    app.add_middleware(MetricsMiddleware, server_timing=SERVER_TIMING)
+
 
 @app.get("/api/health")
 async def health():
@@ -62,16 +91,86 @@ async def get_job_types():
     return JOB_TYPES
 
 
+@app.get("/api/regions")
+async def get_regions():
+    return REGIONS
+
+
+@app.get("/api/ingestion")
+async def ingestion_status():
+    return worker.describe()
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    return cache_stats()
+
+
+@app.get("/api/metrics")
+async def metrics():
+    """Prometheus text exposition of request, stage, upstream and ingestion metrics."""
+    if not registry.enabled:
+        raise HTTPException(status_code=404, detail="metrics are disabled")
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+async def _fetch_page(req: JobsRequest) -> JobsPage:
+    try:
+        return await fetch_all_jobs(
+            query=req.query,
+            categories=req.categories,
+            user_skills=req.skills,
+            filters=req.filters,
+            limit=req.limit,
+            cursor=req.cursor,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/api/jobs", response_model=JobsResponse)
 async def get_jobs(req: JobsRequest):
-    jobs, cached = await fetch_all_jobs(
-        query=req.query,
-        categories=req.categories,
-        user_skills=req.skills,
-        filters=req.filters,
-    )
-    job_models = [Job(**j) for j in jobs]
-    return JobsResponse(jobs=job_models, total=len(job_models), cached=cached)
+    # Postings are validated at ingestion, so the body is assembled from
+    # pre-encoded fragments instead of building and re-validating models
+    page = await _fetch_page(req)
+    with stage("encode"):
+        body = encode_jobs_response(page.encoded(), page.total, page.cached, page.next_cursor)
+    return Response(body, media_type="application/json")
+
+
+@app.post("/api/jobs/stream")
+async def stream_jobs(req: JobsRequest):
+    """Same as POST /api/jobs, as NDJSON: a metadata line, then one job per line.
+
+    The page is ranked before anything is sent; what streams is the
+    encoding, which dominates for large pages, so clients can render the
+    first jobs while the rest are still being encoded.
+    """
+    page = await _fetch_page(req)
+
+    def lines():
+        meta = {"total": page.total, "cached": page.cached, "nextCursor": page.next_cursor}
+        yield json.dumps(meta).encode() + b"\n"
+        # Each chunk is a threadpool hop, so send jobs in batches, not singly
+        fragments = page.encoded()
+        while batch := list(itertools.islice(fragments, STREAM_BATCH_JOBS)):
+            yield b"\n".join(batch) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobDetail)
+async def get_job_details(job_id: str, request: Request):
+    """Full posting, including the description omitted from list responses."""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    body = encode_detail(job, posted_days(job))
+    etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 # --------------- LinkedIn OAuth 2.0 (OpenID Connect) ---------------
@@ -82,7 +181,8 @@ async def linkedin_auth():
     if not LINKEDIN_CLIENT_ID:
         return RedirectResponse(f"{FRONTEND_URL}?auth_error=not_configured")
     state = secrets.token_urlsafe(32)
-    _oauth_states.add(state)
+    # Stored in the shared backend so the callback may land on any worker
+    await backend.set(f"oauth:{state}", b"1", ttl=OAUTH_STATE_TTL_SECONDS)
     params = urllib.parse.urlencode({
         "response_type": "code",
         "client_id": LINKEDIN_CLIENT_ID,
@@ -99,33 +199,32 @@ async def linkedin_callback(code: str = "", state: str = "", error: str = ""):
     if error:
         return RedirectResponse(f"{FRONTEND_URL}?auth_error={urllib.parse.quote(error)}")
 
-    if state not in _oauth_states:
+    if not state or await backend.pop(f"oauth:{state}") is None:
         return RedirectResponse(f"{FRONTEND_URL}?auth_error=invalid_state")
-    _oauth_states.discard(state)
-
-    async with aiohttp.ClientSession() as session:
-        # Exchange authorization code for access token
-        token_resp = await session.post(
-            "https://www.linkedin.com/oauth/v2/accessToken",
-            data={
-                "grant_type": "authorization_code",
-                "code": code,
-                "redirect_uri": LINKEDIN_REDIRECT_URI,
-                "client_id": LINKEDIN_CLIENT_ID,
-                "client_secret": LINKEDIN_CLIENT_SECRET,
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        )
+
+    session = http_client.session
+    # Exchange authorization code for access token
+    async with session.post(
+        "https://www.linkedin.com/oauth/v2/accessToken",
+        data={
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": LINKEDIN_REDIRECT_URI,
+            "client_id": LINKEDIN_CLIENT_ID,
+            "client_secret": LINKEDIN_CLIENT_SECRET,
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    ) as token_resp:
         if token_resp.status != 200:
             return RedirectResponse(f"{FRONTEND_URL}?auth_error=token_failed")
         token_data = await token_resp.json()
-        access_token = token_data.get("access_token")
+    access_token = token_data.get("access_token")
 
-        # Fetch profile via OpenID Connect userinfo endpoint
-        profile_resp = await session.get(
-            "https://api.linkedin.com/v2/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
+    # Fetch profile via OpenID Connect userinfo endpoint
+    async with session.get(
+        "https://api.linkedin.com/v2/userinfo",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as profile_resp:
         if profile_resp.status != 200:
             return RedirectResponse(f"{FRONTEND_URL}?auth_error=profile_failed")
         profile = await profile_resp.json()
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from config import MAX_PAGE_SIZE
 
-class Job(BaseModel):
+
+class JobBase(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
     id: str
@@ -12,12 +14,9 @@ class Job(BaseModel):
     locationType: str
     salary: str
     salaryMin: int
-    match: int
     postedDays: int
-    description: str
     isHtml: bool
     skills: list[str]
-    userSkillMatch: list[str]
     url: str
     jobType: str
     category: str
@@ -25,14 +24,38 @@ class Job(BaseModel):
     linkedinSearchUrl: str = ""
 
 
+class JobSummary(JobBase):
+    """List-view projection: no description body, just a plain-text snippet."""
+    match: int
+    userSkillMatch: list[str]
+    snippet: str = ""
+
+
+class JobDetail(JobBase):
+    description: str
+
+
 class JobsRequest(BaseModel):
     query: str = ""
     categories: list[str] = []
     skills: list[str] = []
     filters: dict = {}
+    limit: int | None = Field(default=None, ge=1, le=MAX_PAGE_SIZE)
+    cursor: str | None = None
+
+    @field_validator("filters")
+    @classmethod
+    def _regions_are_ids(cls, filters: dict) -> dict:
+        regions = filters.get("regions")
+        if regions is not None and not (
+            isinstance(regions, list) and all(isinstance(r, str) for r in regions)
+        ):
+            raise ValueError("filters.regions must be a list of region ids")
+        return filters
 
 
 class JobsResponse(BaseModel):
-    jobs: list[Job]
+    jobs: list[JobSummary]
     total: int
     cached: bool
+    nextCursor: str | None = None
@@ -1,39 +1,57 @@
-import asyncio
-import time
-import random
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Iterator
 from urllib.parse import quote
 
-import aiohttp
+import numpy as np
 
 from config import (
-    DEFAULT_SKILLS, US_STATES, US_CITIES, WORLDWIDE_TERMS, CACHE_TTL_SECONDS,
+    DEFAULT_SKILLS,
+    CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, REQUEST_BUDGET_SECONDS,
+    OFFLOAD_MIN_ROWS,
 )
-from services.remotive import fetch_remotive
-from services.arbeitnow import fetch_arbeitnow
-from services.scoring import score_match, get_matched
-from utils import logo_url, fmt_type
+from services.cache import LRUCache
+from services.backends import backend
+from services.executor import offload
+from services.ingestion import Snapshot, worker
+from services.locations import region_mask
+from services.metrics import registry, stage
+from services.scoring import get_matched, get_matcher, score_match
+from services.pagination import InvalidCursor, fingerprint, encode_cursor, decode_cursor
+from services.serialization import summary_prefix, encode_summary
+from services.store import Ranking
+from utils import fmt_type, text_snippet, posted_days
 from services.linkedin_url import generate_linkedin_search_url
 
-# In-memory cache
-_cache: dict[str, tuple[float, list[dict]]] = {}
+logger = logging.getLogger(__name__)
 
+# In-memory cache of unscored postings per query, keyed by snapshot version.
+# With a shared backend, misses fall through to it before recomputing.
+_cache = LRUCache(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_TTL_SECONDS)
 
-def is_us_location(location: str) -> bool:
-    loc = location.lower().strip()
-    if any(t in loc for t in WORLDWIDE_TERMS):
-        return True
-    if "united states" in loc or "usa" in loc:
-        return True
-    # Check state abbreviation after a comma (e.g. "San Francisco, CA")
-    if "," in location:
-        after_comma = location.split(",")[-1].strip().upper()
-        # Could be "CA" or "CA 94102" — take first token
-        state_token = after_comma.split()[0] if after_comma else ""
-        if state_token in US_STATES:
-            return True
-    if any(city in loc for city in US_CITIES):
-        return True
-    return False
+JOBS_REQUESTS = registry.counter(
+    "matchpoint_jobs_requests_total", "Jobs requests by how they were answered.", ("result",),
+)
+registry.gauge("matchpoint_cache_entries", "Entries in the in-process result cache.", lambda: _cache.stats()["entries"])
+registry.gauge("matchpoint_cache_bytes", "Bytes held by the in-process result cache.", lambda: _cache.stats()["bytes"])
+
+
+@dataclass
+class JobsPage:
+    jobs: Iterable[dict]
+    total: int
+    cached: bool
+    next_cursor: str | None = None
+
+    def encoded(self) -> Iterator[bytes]:
+        """Summary JSON per job, without re-validating anything."""
+        if isinstance(self.jobs, Ranking):
+            yield from self.jobs.encoded()
+            return
+        for j in self.jobs:
+            yield encode_summary(
+                summary_prefix(j), j["match"], j["userSkillMatch"], posted_days(j),
+            )
 
 
 def fallback_jobs(user_skills: list[str]) -> list[dict]:
@@ -70,8 +88,10 @@ def fallback_jobs(user_skills: list[str]) -> list[dict]:
             **j,
             "logo": f"https://logo.clearbit.com/{company_slug}.com?size=100",
             "locationType": "remote",
-            "match": 80 + random.randint(0, 14),
+            "match": score_match(j["skills"], user_skills, j["postedDays"], bool(j["salary"])),
             "isHtml": True,
+            "snippet": text_snippet(j["description"]),
+            "tags": j["skills"],
             "userSkillMatch": get_matched(j["skills"], user_skills)[:2],
             "url": f"https://www.linkedin.com/jobs/search/?keywords={quote(j['title'] + ' ' + j['company'])}",
             "category": "Design",
@@ -86,57 +106,189 @@ async def fetch_all_jobs(
     categories: list[str] | None = None,
     user_skills: list[str] | None = None,
     filters: dict | None = None,
-) -> tuple[list[dict], bool]:
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> JobsPage:
     categories = categories or []
     user_skills = [s.lower() for s in (user_skills or DEFAULT_SKILLS)]
     filters = filters or {}
+    fp = fingerprint(query, categories, user_skills, filters)
+    digest, offset = decode_cursor(cursor, fp) if cursor else (None, 0)
+
+    # Never block on upstreams: read the latest snapshot and let the worker
+    # refresh stale sources in the background. Follow-up pages stay on the
+    # corpus their cursor was issued from, which may have been published by
+    # another worker, and fail once no snapshot of it is retained here.
+    worker.revalidate()
+    snapshot = worker.snapshot
+    if digest is not None:
+        snapshot = worker.snapshot_with(digest)
+        if snapshot is None:
+            raise InvalidCursor("cursor refers to a corpus that is no longer served")
+    elif snapshot.empty:
+        # Cold corpus: give the sources a short budget and serve whichever
+        # finished in time, even if that's only some of them
+        await worker.wait_ready(REQUEST_BUDGET_SECONDS)
+        snapshot = worker.snapshot
+    if snapshot.empty:
+        JOBS_REQUESTS.inc("fallback")
+        return _fallback_page(snapshot, user_skills, filters, offset, limit, fp)
+
+    store = snapshot.store
+    regions = region_mask(filters.get("regions"))
+    selection = f"{query}|{','.join(sorted(categories))}|{regions}"
+    cache_key = f"{snapshot.version}|{selection}"
+    with stage("cache"):
+        cached = _cache.get(cache_key)
+    if cached is None and backend.shared:
+        with stage("shared_cache"):
+            cached = await _load_shared(snapshot, selection)
+        if cached is not None:
+            _cache.set(cache_key, cached)
+            JOBS_REQUESTS.inc("shared_hit")
+    elif cached is not None:
+        JOBS_REQUESTS.inc("hit")
+    if cached is not None:
+        rows, relevance = cached
+        return await _rank(snapshot, rows, relevance, user_skills, filters, offset, limit, fp, True)
+    JOBS_REQUESTS.inc("miss")
+
+    with stage("select"):
+        rows = snapshot.select(categories)
+    # Free-text query is answered by the snapshot's inverted index
+    relevance = None
+    if query:
+        with stage("search"):
+            relevance = snapshot.index.search(query)
+            if relevance is not None:
+                rows = rows[relevance[rows] > 0]
+
+    # Region filter (US only unless the request names regions)
+    with stage("regions"):
+        rows = store.in_regions(rows, regions)
+
+    # Collapse near-duplicates (same job on several boards or reposted),
+    # keeping the richest copy
+    with stage("dedup"):
+        rows = store.duplicates.unique(rows)
+
+    # Cache unscored row ids so one entry serves every skill profile
+    if relevance is not None:
+        relevance = relevance[rows]
+    _cache.set(cache_key, (rows, relevance))
+    if backend.shared:
+        with stage("shared_store"):
+            await _store_shared(snapshot, selection, rows, relevance)
+    return await _rank(snapshot, rows, relevance, user_skills, filters, offset, limit, fp, False)
+
+
+def _shared_keys(snapshot: Snapshot, selection: str) -> list[str]:
+    # Row numbers are per-process, so the shared entry is posting ids keyed
+    # by corpus digest, plus the float32 relevance for queries
+    prefix = f"jobs:{snapshot.digest}:{selection}"
+    return [f"{prefix}:ids", f"{prefix}:rel"]
+
 
-    cache_key = f"{query}|{','.join(sorted(categories))}"
-    now = time.time()
-    if cache_key in _cache:
-        ts, cached_jobs = _cache[cache_key]
-        if now - ts < CACHE_TTL_SECONDS:
-            jobs = _apply_filters(cached_jobs, filters)
-            return jobs, True
-
-    tasks = []
-    cats = categories[:5] if categories else [""]
-    async with aiohttp.ClientSession() as session:
-        for cat in cats:
-            tasks.append(fetch_remotive(session, query, cat, user_skills))
-        tasks.append(fetch_arbeitnow(session, query, user_skills))
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    jobs = []
-    for r in results:
-        if isinstance(r, list):
-            jobs.extend(r)
-
-    # US-only filter
-    jobs = [j for j in jobs if is_us_location(j["location"])]
-
-    # Dedup by title + company
-    seen: set[str] = set()
-    unique = []
-    for j in jobs:
-        key = (j["title"] + j["company"]).lower().replace(" ", "")
-        if key not in seen:
-            seen.add(key)
-            unique.append(j)
-    jobs = unique
-
-    # Sort by match desc
-    jobs.sort(key=lambda j: j["match"], reverse=True)
-
-    if not jobs:
-        jobs = fallback_jobs(user_skills)
-
-    _cache[cache_key] = (now, jobs)
-    jobs = _apply_filters(jobs, filters)
-    return jobs, False
+async def _load_shared(snapshot: Snapshot, selection: str) -> tuple | None:
+    try:
+        ids, rel = await backend.get_many(_shared_keys(snapshot, selection))
+    except Exception as e:
+        logger.warning("shared cache read failed: %r", e)
+        return None
+    if ids is None:
+        return None
+    row_by_id = snapshot.store.row_by_id
+    try:
+        rows = np.array([row_by_id[i] for i in ids.decode().split("\n") if i], dtype=np.int64)
+    except KeyError:
+        return None
+    relevance = np.frombuffer(rel, dtype=np.float32) if rel is not None else None
+    if relevance is not None and len(relevance) != len(rows):
+        return None
+    return rows, relevance
+
+
+async def _store_shared(
+    snapshot: Snapshot, selection: str, rows: np.ndarray, relevance: np.ndarray | None,
+) -> None:
+    ids_key, rel_key = _shared_keys(snapshot, selection)
+    postings = snapshot.store.postings
+    items = {ids_key: "\n".join(postings[i]["id"] for i in rows).encode()}
+    if relevance is not None:
+        items[rel_key] = relevance.astype(np.float32).tobytes()
+    try:
+        # Both keys in one write, so a reader never pairs ids with a
+        # missing or older relevance vector
+        await backend.set_many(items, CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning("shared cache write failed: %r", e)
+
+
+def _next_cursor(digest: str, offset: int, count: int, total: int, fp: int) -> str | None:
+    end = offset + count
+    return encode_cursor(digest, end, fp) if count and end < total else None
+
+
+async def _rank(
+    snapshot: Snapshot,
+    rows: np.ndarray,
+    relevance: np.ndarray | None,
+    user_skills: list[str],
+    filters: dict,
+    offset: int,
+    limit: int | None,
+    fp: int,
+    cached: bool,
+) -> JobsPage:
+    if not len(rows):
+        JOBS_REQUESTS.inc("fallback")
+        return _fallback_page(snapshot, user_skills, filters, offset, limit, fp)
+    # Scoring is vectorized, but over a very large selection it still holds
+    # the loop for milliseconds, so that moves to a thread
+    with stage("rank"):
+        ranking = await offload.run(
+            snapshot.store.rank, rows, get_matcher(user_skills), filters, offset, limit,
+            relevance=relevance, size=len(rows), min_size=OFFLOAD_MIN_ROWS,
+        )
+    return JobsPage(
+        jobs=ranking,
+        total=ranking.total,
+        cached=cached,
+        next_cursor=_next_cursor(snapshot.digest, offset, len(ranking), ranking.total, fp),
+    )
+
+
+def _fallback_page(
+    snapshot: Snapshot,
+    user_skills: list[str],
+    filters: dict,
+    offset: int,
+    limit: int | None,
+    fp: int,
+) -> JobsPage:
+    jobs = _apply_filters(fallback_jobs(user_skills), filters)
+    page = jobs[offset:None if limit is None else offset + limit]
+    return JobsPage(
+        jobs=page,
+        total=len(jobs),
+        cached=False,
+        next_cursor=_next_cursor(snapshot.digest, offset, len(page), len(jobs), fp),
+    )
+
+
+def get_job(job_id: str) -> dict | None:
+    """Unscored posting by id from the current snapshot (or the fallback set)."""
+    store = worker.snapshot.store
+    row = store.row_by_id.get(job_id)
+    if row is not None:
+        return store.postings[row]
+    if job_id.startswith("fb-"):
+        return next((j for j in fallback_jobs(DEFAULT_SKILLS) if j["id"] == job_id), None)
+    return None
 
 
 def _apply_filters(jobs: list[dict], filters: dict) -> list[dict]:
+    # List-based twin of JobStore.filter, used for the static fallback jobs
     result = jobs
 
     # Minimum salary filter
@@ -158,3 +310,7 @@ def _apply_filters(jobs: list[dict], filters: dict) -> list[dict]:
     if filters.get("recent"):
         result = [j for j in result if j["postedDays"] <= 7]
     return result
+
+
+def cache_stats() -> dict:
+    return _cache.stats()
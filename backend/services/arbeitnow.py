@@ -1,19 +1,44 @@
-import aiohttp
-import random
-from config import ARBEITNOW_URL, ARBEITNOW_LIMIT
-from utils import title_case, days_ago, logo_url
-from services.scoring import score_match, get_matched
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+from config import ARBEITNOW_URL, ARBEITNOW_MAX_PAGES
+from utils import title_case, parse_timestamp, days_since, logo_url, text_snippet
 from services.linkedin_url import generate_linkedin_search_url
+from services.http_client import HttpClient
+from services.crawler import CrawlError
+from services.executor import inline_batches
+from services.jsonstream import project
+from services.serialization import content_hash
 
+logger = logging.getLogger(__name__)
 
-def map_arbeitnow(r: dict, user_skills: list[str]) -> dict:
+# Record fields map_arbeitnow reads; the rest are dropped as records arrive
+ARBEITNOW_FIELDS = (
+    "slug", "title", "company_name", "company_logo", "location", "remote", "created_at",
+    "description", "tags", "url", "job_types",
+)
+
+
+def _slug(r: dict) -> str:
+    # Records without a slug get one from their content, so the id stays
+    # stable across refreshes as long as the record doesn't change
+    return r.get("slug") or content_hash(r)
+
+
+def arbeitnow_id(r: dict) -> str:
+    return f"an-{_slug(r)}"
+
+
+def map_arbeitnow(r: dict) -> dict:
     tags = [title_case(t.strip()) for t in (r.get("tags") or []) if t.strip()]
     title = (r.get("title") or "").strip() or "Untitled"
     company = r.get("company_name") or "Unknown"
-    slug = r.get("slug") or f"{random.randint(10000, 99999)}"
+    slug = _slug(r)
     location = r.get("location") or ("Remote" if r.get("remote") else "Unknown")
+    posted_at = parse_timestamp(r.get("created_at"))
     return {
-        "id": f"an-{slug}",
+        "id": arbeitnow_id(r),
         "title": title,
         "company": company,
         "logo": logo_url(company, r.get("company_logo", "")),
@@ -21,12 +46,13 @@ def map_arbeitnow(r: dict, user_skills: list[str]) -> dict:
         "locationType": "remote" if r.get("remote") else "onsite",
         "salary": "",
         "salaryMin": 0,
-        "match": score_match(tags, user_skills),
-        "postedDays": days_ago(r.get("created_at") or ""),
+        "postedDays": days_since(posted_at),
+        "postedAt": posted_at,
         "description": r.get("description") or "",
+        "snippet": text_snippet(r.get("description") or ""),
         "isHtml": True,
         "skills": tags[:6],
-        "userSkillMatch": get_matched(tags, user_skills)[:6],
+        "tags": tags,
         "url": r.get("url") or f"https://www.arbeitnow.com/view/{slug}",
         "jobType": (r.get("job_types") or ["Full-time"])[0],
         "category": "",
@@ -36,21 +62,76 @@ def map_arbeitnow(r: dict, user_skills: list[str]) -> dict:
 
 
 async def fetch_arbeitnow(
-    session: aiohttp.ClientSession,
-    query: str,
-    user_skills: list[str],
+    client: HttpClient,
+    mapper: Callable[[list[dict]], Awaitable[list[dict | None]]] = inline_batches(map_arbeitnow),
+    max_pages: int = ARBEITNOW_MAX_PAGES,
+    stop: Callable[[list[dict]], bool] | None = None,
+    deadline: float | None = None,
 ) -> list[dict]:
-    async with session.get(ARBEITNOW_URL) as resp:
-        if resp.status != 200:
-            return []
-        data = await resp.json()
-        jobs = [map_arbeitnow(r, user_skills) for r in (data.get("data") or [])]
-        if query:
-            q = query.lower()
-            jobs = [
-                j for j in jobs
-                if q in j["title"].lower()
-                or q in j["company"].lower()
-                or any(q in s.lower() for s in j["skills"])
-            ]
-        return jobs[:ARBEITNOW_LIMIT]
+    """Follow ``links.next`` for up to ``max_pages`` pages.
+
+    ``stop`` sees each page's mapped jobs and can end the crawl early. A page
+    that can't be fetched raises CrawlError, and one still loading at the
+    ``time.monotonic()`` ``deadline`` raises TimeoutError.
+    """
+    jobs = []
+    url, params = ARBEITNOW_URL, None
+    for _ in range(max_pages):
+        request = client.get_items(
+            url, params, "data", lambda rs: mapper([project(r, ARBEITNOW_FIELDS) for r in rs]),
+        )
+        if deadline is not None:
+            request = asyncio.wait_for(request, max(0.0, deadline - time.monotonic()))
+        status, page, rest = await request
+        if status != 200:
+            raise CrawlError(f"GET {url} returned {status}")
+        jobs.extend(page)
+        url = (rest.get("links") or {}).get("next")
+        if not url or (stop is not None and stop(page)):
+            break
+    return jobs
+
+
+class ArbeitnowSource:
+    """The whole Arbeitnow board as one feed, crawled newest page first."""
+
+    name = "arbeitnow"
+    record_id = staticmethod(arbeitnow_id)
+    map = staticmethod(map_arbeitnow)
+
+    async def fetch(
+        self,
+        client: HttpClient,
+        mapper: Callable[[list[dict]], Awaitable[list[dict | None]]],
+        held: dict[str, dict],
+        full: bool,
+        timeout: float,
+    ) -> dict[str, list[dict]]:
+        deadline = time.monotonic() + timeout
+        stopped = False
+        pages: list[list[dict]] = []
+
+        def stop(page: list[dict]) -> bool:
+            # Pages are newest first: once a whole page is postings we already
+            # hold unchanged, the older pages behind it are assumed unchanged too
+            nonlocal stopped
+            pages.append(page)
+            stopped = time.monotonic() >= deadline or (
+                not full and bool(page) and all(held.get(p["id"]) is p for p in page)
+            )
+            return stopped
+
+        try:
+            jobs = await fetch_arbeitnow(client, mapper, stop=stop, deadline=deadline)
+        except Exception as e:
+            # Failing or running out of time on the first page fails the
+            # source; on a later page it only ends the crawl there
+            if not pages:
+                raise
+            logger.warning("arbeitnow crawl stopped after %d pages: %r", len(pages), e)
+            jobs = [p for page in pages for p in page]
+            stopped = True
+        if stopped:
+            fetched = {p["id"] for p in jobs}
+            jobs += [p for p in held.values() if p["id"] not in fetched]
+        return {"arbeitnow": jobs}
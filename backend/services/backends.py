@@ -0,0 +1,140 @@
+import logging
+from typing import Any, Protocol
+
+from config import (
+    REDIS_URL, BACKEND_KEY_PREFIX, STATE_CACHE_MAX_ENTRIES, STATE_CACHE_MAX_BYTES,
+    CACHE_TTL_SECONDS,
+)
+from services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class Backend(Protocol):
+    """Byte-valued key/value store for cache entries and short-lived state.
+
+    ``shared`` tells callers whether other workers see the same data, i.e.
+    whether it is worth paying encode/decode costs to go through it.
+    """
+
+    shared: bool
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None: ...
+
+    async def set_many(self, items: dict[str, bytes], ttl: float | None = None) -> None: ...
+
+    async def pop(self, key: str) -> bytes | None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryBackend:
+    """Process-local backend; fine for a single worker and for development."""
+
+    shared = False
+
+    def __init__(
+        self,
+        max_entries: int = STATE_CACHE_MAX_ENTRIES,
+        max_bytes: int = STATE_CACHE_MAX_BYTES,
+        ttl: float = CACHE_TTL_SECONDS,
+    ):
+        self._cache = LRUCache(max_entries, max_bytes, ttl, sizer=len)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return [self._cache.get(k) for k in keys]
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def set_many(self, items: dict[str, bytes], ttl: float | None = None) -> None:
+        for key, value in items.items():
+            self._cache.set(key, value, ttl)
+
+    async def pop(self, key: str) -> bytes | None:
+        value = self._cache.get(key)
+        self._cache.delete(key)
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBackend:
+    """Backend over any Redis-protocol server, shared by every worker.
+
+    ``client`` is a ``redis.asyncio.Redis``-compatible object, so a
+    ``fakeredis.aioredis.FakeRedis`` can stand in for a real server.
+    Keys are namespaced with ``prefix``.
+    """
+
+    shared = True
+
+    def __init__(self, client: Any, prefix: str = BACKEND_KEY_PREFIX):
+        self._client = client
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(self._key(key))
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        # One round trip for the whole batch
+        return await self._client.mget([self._key(k) for k in keys])
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        px = int(ttl * 1000) if ttl else None
+        await self._client.set(self._key(key), value, px=px)
+
+    async def set_many(self, items: dict[str, bytes], ttl: float | None = None) -> None:
+        # One MULTI so readers never see some keys of the batch without the rest
+        px = int(ttl * 1000) if ttl else None
+        async with self._client.pipeline(transaction=True) as pipe:
+            for key, value in items.items():
+                pipe.set(self._key(key), value, px=px)
+            await pipe.execute()
+
+    async def pop(self, key: str) -> bytes | None:
+        # GET + DEL in one MULTI so a value is handed out at most once
+        # (GETDEL needs Redis 6.2, this works everywhere)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.get(self._key(key))
+            pipe.delete(self._key(key))
+            value, _deleted = await pipe.execute()
+        return value
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._key(key))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_backend(url: str = REDIS_URL) -> Backend:
+    if not url:
+        return MemoryBackend()
+    try:
+        import redis.asyncio as redis
+    except ImportError:
+        logger.warning("REDIS_URL is set but the redis package is missing; using memory backend")
+        return MemoryBackend()
+    return RedisBackend(redis.from_url(url))
+
+
+backend = create_backend()
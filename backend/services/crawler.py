@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+import aiohttp
+
+from config import (
+    CRAWL_CONCURRENCY, CRAWL_RATE_LIMITS, CRAWL_DEFAULT_RATE, CRAWL_RETRIES, CRAWL_BACKOFF_BASE,
+    CRAWL_BACKOFF_MAX, BREAKER_FAILURES, BREAKER_COOLDOWN_SECONDS,
+)
+from services.http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statuses worth retrying: throttling and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CrawlError(Exception):
+    """An upstream request failed: an error status, or still failing after every retry."""
+
+
+def backoff_delay(attempt: int, base: float = CRAWL_BACKOFF_BASE, cap: float = CRAWL_BACKOFF_MAX) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart.
+
+    Each caller reserves the next free slot before sleeping, so concurrent
+    callers queue up instead of bursting together when a slot opens.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        at = max(now, self._next)
+        self._next = at + self.interval
+        if at > now:
+            await asyncio.sleep(at - now)
+
+
+class CrawlClient:
+    """``HttpClient`` front used by the crawler for one source.
+
+    Requests are rate limited per source, share one concurrency cap across
+    all sources and are retried with jittered backoff on connection errors,
+    timeouts and the statuses in ``RETRY_STATUSES``. It exposes the same
+    ``get_items`` as ``HttpClient``, so source fetchers take either.
+    """
+
+    def __init__(
+        self,
+        http: HttpClient,
+        rate: float,
+        semaphore: asyncio.Semaphore,
+        retries: int = CRAWL_RETRIES,
+    ):
+        self.http = http
+        self.limiter = RateLimiter(rate)
+        self.semaphore = semaphore
+        self.retries = retries
+        self.requests = 0
+        self.retried = 0
+
+    async def get_items(
+        self,
+        url: str,
+        params: dict | None,
+        key: str,
+        fn: Callable[[list[dict]], Awaitable[list[T | None]]],
+    ) -> tuple[int, list[T], Any]:
+        # A retry starts the listing over; results of a failed attempt are dropped
+        return await self._retrying(url, lambda: self.http.get_items(url, params, key, fn))
+
+    async def _retrying(self, url: str, request: Callable[[], Awaitable[tuple]]) -> tuple:
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.retried += 1
+                await asyncio.sleep(backoff_delay(attempt - 1))
+            # Wait for a rate slot before taking a concurrency slot, so a
+            # throttled source doesn't hold one while it sleeps
+            await self.limiter.wait()
+            async with self.semaphore:
+                self.requests += 1
+                try:
+                    result = await request()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = repr(e)
+                    logger.info("GET %s failed (attempt %d): %s", url, attempt + 1, error)
+                    continue
+            status = result[0]
+            if status not in RETRY_STATUSES:
+                return result
+            error = f"HTTP {status}"
+            logger.info("GET %s returned %d (attempt %d)", url, status, attempt + 1)
+        raise CrawlError(f"GET {url} failed after {self.retries + 1} attempts: {error}")
+
+
+class Crawler:
+    """One ``CrawlClient`` per source over a shared concurrency semaphore."""
+
+    def __init__(
+        self,
+        http: HttpClient,
+        rates: dict[str, float] | None = None,
+        concurrency: int = CRAWL_CONCURRENCY,
+    ):
+        self.http = http
+        self.rates = rates or CRAWL_RATE_LIMITS
+        self.concurrency = concurrency
+        self._semaphore: asyncio.Semaphore | None = None
+        self._clients: dict[str, CrawlClient] = {}
+
+    def client(self, source: str) -> CrawlClient:
+        c = self._clients.get(source)
+        if c is None:
+            if self._semaphore is None:
+                # Created lazily so it binds to the running event loop
+                self._semaphore = asyncio.Semaphore(self.concurrency)
+            c = self._clients[source] = CrawlClient(
+                self.http, self.rates.get(source, CRAWL_DEFAULT_RATE), self._semaphore,
+            )
+        return c
+
+    def describe(self) -> dict:
+        return {
+            name: {"requests": c.requests, "retries": c.retried}
+            for name, c in self._clients.items()
+        }
+
+
+async def gather_within(coros: dict[str, Awaitable[T]], timeout: float) -> dict[str, T]:
+    """Run ``coros`` concurrently; results of those that finished within ``timeout``.
+
+    Failures and stragglers are logged and left out; stragglers are cancelled.
+    """
+    tasks = {key: asyncio.ensure_future(c) for key, c in coros.items()}
+    if not tasks:
+        return {}
+    done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    for t in pending:
+        t.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    results = {}
+    for key, t in tasks.items():
+        if t not in done:
+            logger.warning("%s missed the %.1fs deadline", key, timeout)
+        elif t.exception() is not None:
+            logger.warning("%s failed: %r", key, t.exception())
+        else:
+            results[key] = t.result()
+    return results
+
+
+class CircuitBreaker:
+    """Stops calling an upstream after ``threshold`` consecutive failures.
+
+    While open, calls are refused for ``cooldown`` seconds. After that one
+    trial call is let through (half-open); success closes the breaker and
+    failure opens it again.
+    """
+
+    def __init__(self, threshold: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN_SECONDS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.trips = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.state != "open":
+                self.trips += 1
+            self._opened_at = time.monotonic()
+
+    def as_dict(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "trips": self.trips}
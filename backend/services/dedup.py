@@ -0,0 +1,180 @@
+import re
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from config import (
+    DEDUP_NUM_PERM, DEDUP_BANDS, DEDUP_THRESHOLD, DEDUP_TITLE_OVERLAP, DEDUP_TEXT_CHARS,
+)
+from utils import strip_html
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:[+#]+)?")
+_BRACKETS_RE = re.compile(r"\[[^\]]*\]|\([^)]*\)")
+
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "gmbh", "corp", "corporation",
+    "co", "company", "plc", "ag", "sa", "srl", "bv", "oy", "ab", "pty", "the",
+}
+_TITLE_WORDS = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "jnr": "junior",
+    "eng": "engineer", "engr": "engineer", "dev": "developer", "mgr": "manager",
+    "mngr": "manager", "swe": "software engineer", "sde": "software engineer",
+    "ml": "machine learning", "i": "1", "ii": "2", "iii": "3", "iv": "4",
+}
+# Two-word spellings folded into one token before expansion
+_TITLE_JOINS = re.compile(r"\b(front|back|full)[\s-]+(end|stack)\b")
+_TITLE_NOISE = {"remote", "hybrid", "onsite", "m", "w", "f", "d"}
+
+# Random hash family h(x) = a * x + b (uint64 arithmetic) for MinHash
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, 2**32, size=DEDUP_NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**32, size=DEDUP_NUM_PERM, dtype=np.uint64)
+_ROWS = DEDUP_NUM_PERM // DEDUP_BANDS
+
+
+def normalize_company(name: str) -> str:
+    """"Acme, Inc." and "ACME" both become "acme"."""
+    words = _WORD_RE.findall(name.lower().replace("&", " and "))
+    kept = [w for w in words if w not in _COMPANY_SUFFIXES]
+    return " ".join(kept or words)
+
+
+def canonical_title(title: str) -> str:
+    """"Sr. Front-End Eng (Remote)" and "Senior Frontend Engineer" become the same string."""
+    text = _BRACKETS_RE.sub(" ", title.lower())
+    text = _TITLE_JOINS.sub(r"\1\2", text)
+    words = []
+    for w in _WORD_RE.findall(text):
+        if w in _TITLE_NOISE:
+            continue
+        words.extend(_TITLE_WORDS.get(w, w).split())
+    return " ".join(words)
+
+
+@lru_cache(maxsize=1 << 17)
+def _word_hash(word: str) -> int:
+    return zlib.crc32(word.encode())
+
+
+def _shingles(job: dict) -> np.ndarray:
+    """Hashes of word 3-grams over title and the start of the description."""
+    text = strip_html(job["description"][:DEDUP_TEXT_CHARS]).lower()
+    words = canonical_title(job["title"]).split() + _WORD_RE.findall(text)
+    h = np.fromiter(map(_word_hash, words), dtype=np.uint64, count=len(words))
+    if len(h) < 3:
+        return h
+    # Combine neighbouring word hashes instead of hashing joined strings
+    return h[:-2] * np.uint64(0x9E3779B1) ^ h[1:-1] * np.uint64(0x85EBCA77) ^ h[2:]
+
+
+def minhash(job: dict) -> np.ndarray | None:
+    """MinHash signature of a posting's text; None if it has none."""
+    shingles = _shingles(job)
+    if not len(shingles):
+        return None
+    return (np.outer(_A, shingles) + _B[:, None]).min(axis=1)
+
+
+def richness(job: dict) -> tuple:
+    """Sort key for which copy of a duplicate to keep: salary first, then detail."""
+    return (
+        bool(job["salary"]), job["salaryMin"] > 0, job.get("postedAt") is not None,
+        len(job["tags"]), len(job["description"]),
+    )
+
+
+def _title_overlap(a: str, b: str) -> float:
+    sa, sb = set(a.split()), set(b.split())
+    return len(sa & sb) / len(sa | sb) if sa and sb else 0.0
+
+
+@dataclass
+class Duplicates:
+    """Near-duplicate clusters over a posting list.
+
+    ``cluster[i]`` is the row of the richest posting in row ``i``'s cluster
+    (``i`` itself for unique postings) and ``rank[i]`` orders rows by
+    ``richness``. ``signatures`` caches MinHash signatures by id and content
+    hash so the next corpus only hashes new or edited postings.
+    """
+    cluster: np.ndarray
+    rank: np.ndarray
+    signatures: dict[tuple, np.ndarray | None]
+
+    def unique(self, rows: np.ndarray) -> np.ndarray:
+        """``rows`` minus duplicates, keeping the richest of each cluster, in input order."""
+        if len(rows) < 2:
+            return rows
+        order = np.lexsort((-self.rank[rows], self.cluster[rows]))
+        clusters = self.cluster[rows][order]
+        first = np.concatenate(([True], clusters[1:] != clusters[:-1]))
+        return rows[np.sort(order[first])]
+
+
+def find_duplicates(postings: list[dict], previous: Duplicates | None = None) -> Duplicates:
+    """Cluster postings that are the same job, in time linear in the corpus.
+
+    Two postings are duplicates when their normalized company matches and
+    either their canonical titles are equal, or their titles overlap and
+    their MinHash signatures agree on at least ``DEDUP_THRESHOLD`` of slots.
+    Candidates for the MinHash test come from LSH banding, and each bucket
+    is compared against its first member only, so no step is quadratic.
+    """
+    n = len(postings)
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    cached = previous.signatures if previous is not None else {}
+    signatures: dict[tuple, np.ndarray | None] = {}
+    sigs: list[np.ndarray | None] = [None] * n
+    companies = [normalize_company(j["company"]) for j in postings]
+    titles = [canonical_title(j["title"]) for j in postings]
+    exact: dict[tuple[str, str], int] = {}
+    buckets: dict[tuple, int] = {}
+    for i, job in enumerate(postings):
+        key = (companies[i], titles[i].replace(" ", ""))
+        first = exact.setdefault(key, i)
+        if first != i:
+            union(first, i)
+            continue
+
+        sig_key = (job["id"], job.get("contentHash"))
+        sig = sigs[i] = cached[sig_key] if sig_key[1] and sig_key in cached else minhash(job)
+        if sig_key[1]:
+            signatures[sig_key] = sig
+        if sig is None:
+            continue
+        for band in range(DEDUP_BANDS):
+            bucket = (companies[i], band, sig[band * _ROWS:(band + 1) * _ROWS].tobytes())
+            other = buckets.setdefault(bucket, i)
+            if other == i or find(other) == find(i):
+                continue
+            if (
+                _title_overlap(titles[i], titles[other]) >= DEDUP_TITLE_OVERLAP
+                and float((sig == sigs[other]).mean()) >= DEDUP_THRESHOLD
+            ):
+                union(other, i)
+
+    rank = np.empty(n, dtype=np.int64)
+    rank[sorted(range(n), key=lambda i: richness(postings[i]))] = np.arange(n)
+    roots = np.fromiter((find(i) for i in range(n)), dtype=np.int64, count=n)
+    # Label every cluster by its richest row
+    best: dict[int, int] = {}
+    for i, root in enumerate(roots.tolist()):
+        b = best.get(root)
+        if b is None or rank[i] > rank[b]:
+            best[root] = i
+    cluster = np.fromiter((best[r] for r in roots.tolist()), dtype=np.int64, count=n)
+    return Duplicates(cluster, rank, signatures)
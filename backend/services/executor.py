@@ -0,0 +1,95 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, TypeVar
+
+from config import OFFLOAD_EXECUTOR, OFFLOAD_WORKERS, OFFLOAD_THREADS, OFFLOAD_CHUNK_RECORDS
+from services.metrics import registry
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+OFFLOADED = registry.counter(
+    "matchpoint_offload_tasks_total", "Batches handed to a pool instead of run on the event loop.",
+    ("pool",),
+)
+
+
+def _map_chunk(fn: Callable[[T], R], items: list[T]) -> list[R]:
+    return [fn(x) for x in items]
+
+
+class Offloader:
+    """Runs CPU-bound batches off the event loop once they are big enough to matter.
+
+    ``kind`` picks the pool ``map`` uses: "thread", "process" or "inline"
+    (everything stays on the loop); ``workers`` sizes the process pool and
+    ``threads`` the thread pool. ``map`` hands items over in chunks of
+    ``chunk``, so a process pool pickles a few large messages rather than
+    one per item; functions given to it must be picklable (module-level, or
+    partials of those). ``run`` always uses a thread, for work on objects
+    that must stay in this process. Batches under ``min_size`` run inline,
+    where handing them over would cost more than it saves.
+    """
+
+    def __init__(self, kind: str = "thread", workers: int = 4, chunk: int = 64, threads: int = 2):
+        self.kind = kind
+        self.workers = workers
+        self.chunk = chunk
+        self.threads = threads
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.threads, thread_name_prefix="offload")
+        return self._threads
+
+    def _map_pool(self) -> Executor:
+        if self.kind != "process":
+            return self._thread_pool()
+        if self._processes is None:
+            # Spawned rather than forked: forking a process that runs an event
+            # loop and pool threads can copy held locks into the child
+            self._processes = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._processes
+
+    async def run(self, fn: Callable[..., R], *args: Any, size: int, min_size: int, **kwargs: Any) -> R:
+        """``fn(*args, **kwargs)``, in a thread when ``size`` reaches ``min_size``."""
+        if self.kind == "inline" or size < min_size:
+            return fn(*args, **kwargs)
+        OFFLOADED.inc("thread")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread_pool(), partial(fn, *args, **kwargs))
+
+    async def map(self, fn: Callable[[T], R], items: list[T], min_size: int) -> list[R]:
+        """``[fn(x) for x in items]``, in the pool when there are ``min_size`` items or more."""
+        if self.kind == "inline" or len(items) < min_size:
+            return [fn(x) for x in items]
+        pool = self._map_pool()
+        OFFLOADED.inc(self.kind)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, _map_chunk, fn, items[i:i + self.chunk])
+            for i in range(0, len(items), self.chunk)
+        ))
+        return [r for chunk in chunks for r in chunk]
+
+    def shutdown(self) -> None:
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
+
+
+def inline_batches(fn: Callable[[T], R]) -> Callable[[list[T]], Awaitable[list[R]]]:
+    """``fn`` as a batch mapper that runs on the loop, for fetchers used directly."""
+    async def mapper(items: list[T]) -> list[R]:
+        return [fn(x) for x in items]
+    return mapper
+
+
+offload = Offloader(OFFLOAD_EXECUTOR, OFFLOAD_WORKERS, OFFLOAD_CHUNK_RECORDS, OFFLOAD_THREADS)
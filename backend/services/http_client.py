@@ -0,0 +1,125 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+from urllib.parse import urlsplit
+
+import aiohttp
+import orjson
+
+from config import (
+    HTTP_LIMIT, HTTP_LIMIT_PER_HOST, HTTP_DNS_TTL_SECONDS, HTTP_KEEPALIVE_SECONDS,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_TOTAL_TIMEOUT, HTTP_STREAM_CHUNK_BYTES,
+)
+from services.jsonstream import ArrayStream
+from services.metrics import registry
+
+T = TypeVar("T")
+
+UPSTREAM_REQUESTS = registry.counter(
+    "matchpoint_upstream_requests_total", "Upstream GETs by host and status.", ("host", "status"),
+)
+UPSTREAM_SECONDS = registry.histogram(
+    "matchpoint_upstream_request_seconds", "Upstream GET latency.", ("host",),
+)
+UPSTREAM_BYTES = registry.counter(
+    "matchpoint_upstream_response_bytes_total", "Upstream response body bytes.", ("host",),
+)
+
+
+class HttpClient:
+    """Application-scoped aiohttp session with pooled keep-alive connections.
+
+    Requests are not coalesced here: listings are only fetched by the
+    ingestion worker, which runs at most one refresh per source at a time.
+    """
+
+    def __init__(self):
+        self._session: aiohttp.ClientSession | None = None
+
+    async def start(self) -> None:
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_LIMIT,
+            limit_per_host=HTTP_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_TTL_SECONDS,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=HTTP_TOTAL_TIMEOUT,
+            sock_connect=HTTP_CONNECT_TIMEOUT,
+            sock_read=HTTP_READ_TIMEOUT,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            raise RuntimeError("HttpClient used before start()")
+        return self._session
+
+    async def get_json(self, url: str, params: dict | None = None) -> tuple[int, Any]:
+        """GET ``url`` and return ``(status, body)``; body is None unless status is 200."""
+        host = urlsplit(url).hostname or ""
+        start = time.perf_counter()
+        status = "error"
+        try:
+            async with self.session.get(url, params=params) as resp:
+                status = resp.status
+                if resp.status != 200:
+                    return resp.status, None
+                body = await resp.read()
+                UPSTREAM_BYTES.inc(host, amount=len(body))
+                return resp.status, orjson.loads(body)
+        finally:
+            UPSTREAM_SECONDS.observe(time.perf_counter() - start, host)
+            UPSTREAM_REQUESTS.inc(host, status)
+
+    async def get_items(
+        self,
+        url: str,
+        params: dict | None,
+        key: str,
+        fn: Callable[[list[dict]], Awaitable[list[T | None]]],
+    ) -> tuple[int, list[T], Any]:
+        """GET a JSON object, passing the elements of its ``key`` array to ``fn`` as they download.
+
+        ``fn`` maps each batch of elements that arrived together. Returns
+        ``(status, results, rest)``: the non-None results of ``fn`` and the
+        rest of the document with that array emptied (None unless status is
+        200). A 200 body without the array raises ValueError. Elements are
+        decoded one at a time, never the whole body at once.
+        """
+        host = urlsplit(url).hostname or ""
+        start = time.perf_counter()
+        status = "error"
+        try:
+            async with self.session.get(url, params=params) as resp:
+                status = resp.status
+                if resp.status != 200:
+                    return resp.status, [], None
+                stream = ArrayStream(key)
+                results = []
+                async for chunk in resp.content.iter_chunked(HTTP_STREAM_CHUNK_BYTES):
+                    UPSTREAM_BYTES.inc(host, amount=len(chunk))
+                    records = stream.feed(chunk)
+                    if records:
+                        results.extend(r for r in await fn(records) if r is not None)
+                    # Reading a chunk that is already buffered doesn't yield,
+                    # so give other tasks a turn between batches
+                    await asyncio.sleep(0)
+                rest = stream.close()
+                if not stream.found:
+                    raise ValueError(f"GET {url} returned no {key!r} array")
+                return resp.status, results, rest
+        finally:
+            UPSTREAM_SECONDS.observe(time.perf_counter() - start, host)
+            UPSTREAM_REQUESTS.inc(host, status)
+
+
+client = HttpClient()
@@ -0,0 +1,528 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable
+
+import numpy as np
+
+from config import (
+    REFRESH_INTERVALS, REFRESH_DEFAULT_SECONDS, REFRESH_RETRY_SECONDS, SNAPSHOT_HISTORY,
+    SNAPSHOT_PATH, CRAWL_FULL_SECONDS, SOURCE_TIMEOUT_SECONDS, OFFLOAD_MIN_RECORDS,
+    OFFLOAD_MIN_POSTINGS,
+)
+from services.http_client import client
+from services.metrics import registry
+from services.crawler import Crawler, CircuitBreaker
+from services.executor import offload
+from services.sources import SOURCES
+from services.store import JobStore
+from services.search import SearchIndex
+from services.serialization import map_posting
+from services.persistence import FileLease, save_snapshot, load_snapshot, snapshot_mtime
+
+logger = logging.getLogger(__name__)
+
+INGEST_RUNS = registry.counter(
+    "matchpoint_ingest_runs_total", "Source refreshes by outcome.", ("source", "result"),
+)
+INGEST_SECONDS = registry.histogram(
+    "matchpoint_ingest_seconds", "Time to fetch and map one source.", ("source",),
+)
+PUBLISH_SECONDS = registry.histogram(
+    "matchpoint_publish_seconds", "Time to build and publish a snapshot.",
+)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Immutable view of the ingested corpus.
+
+    Every posting lives in one columnar ``store``, tagged with its feed: one
+    upstream listing, ``remotive:<category-id>`` per Remotive category and
+    ``arbeitnow`` for the whole Arbeitnow board.
+    """
+    version: int = 0
+    built_at: float = 0.0
+    # Content id of the corpus: equal across workers holding the same postings
+    digest: str = ""
+    store: JobStore = field(default_factory=lambda: JobStore([]))
+    index: SearchIndex = field(default_factory=lambda: SearchIndex([]))
+
+    @property
+    def empty(self) -> bool:
+        return not len(self.store)
+
+    def select(self, categories: list[str] | None = None) -> np.ndarray:
+        """Rows from the given Remotive categories (all if empty) plus Arbeitnow."""
+        if not categories:
+            return np.arange(len(self.store))
+        return self.store.rows_in_feeds([f"remotive:{c}" for c in categories] + ["arbeitnow"])
+
+
+@dataclass
+class SourceStatus:
+    interval: float
+    last_success: float | None = None
+    last_attempt: float | None = None
+    last_error: str | None = None
+    jobs: int = 0
+    # What the last successful refresh changed, by posting id
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "intervalSeconds": self.interval,
+            "lastSuccess": self.last_success,
+            "lastAttempt": self.last_attempt,
+            "lastError": self.last_error,
+            "jobs": self.jobs,
+            "delta": {
+                "added": self.added,
+                "updated": self.updated,
+                "unchanged": self.unchanged,
+                "removed": self.removed,
+            },
+            "stale": self.is_stale(),
+        }
+
+    def is_stale(self, now: float | None = None) -> bool:
+        if self.last_success is None:
+            return True
+        return (now or time.time()) - self.last_success >= self.interval
+
+
+class DeltaMapper:
+    """Maps raw upstream records, reusing postings whose record is unchanged.
+
+    Each record is hashed as the source hands it over (projected to the
+    fields its mapper reads). When its id and hash match a posting
+    already held, that same posting object is returned: it skips mapping and
+    validation, and keeps its cached summary encoding and index terms.
+    ``map_many`` does the same for a batch, mapping the changed records
+    through ``offload``. Outcomes are counted once per posting id, so a
+    listing retried after a failed attempt isn't counted twice.
+    """
+
+    def __init__(
+        self,
+        map_fn: Callable[[dict], dict],
+        id_fn: Callable[[dict], str],
+        known: dict[str, dict],
+    ):
+        self.map_fn = map_fn
+        self.id_fn = id_fn
+        self.known = known
+        self._outcomes: dict[str, str] = {}
+
+    @property
+    def added(self) -> int:
+        return self._count("added")
+
+    @property
+    def updated(self) -> int:
+        return self._count("updated")
+
+    @property
+    def unchanged(self) -> int:
+        return self._count("unchanged")
+
+    def _count(self, outcome: str) -> int:
+        return sum(1 for o in self._outcomes.values() if o == outcome)
+
+    def __call__(self, r: dict) -> dict | None:
+        posting_id = self.id_fn(r)
+        old = self.known.get(posting_id)
+        result = map_posting(self.map_fn, (r, old and old.get("contentHash")))
+        return self._resolve(posting_id, result, old)
+
+    async def map_many(self, records: list[dict]) -> list[dict | None]:
+        # Hashing goes to the pool with the mapping, so an unchanged batch
+        # costs the loop only the id lookups
+        ids = [self.id_fn(r) for r in records]
+        held = [self.known.get(i) for i in ids]
+        results = await offload.map(
+            partial(map_posting, self.map_fn),
+            [(r, old and old.get("contentHash")) for r, old in zip(records, held)],
+            OFFLOAD_MIN_RECORDS,
+        )
+        return [self._resolve(*args) for args in zip(ids, results, held)]
+
+    def _resolve(
+        self, posting_id: str, result: tuple[str, dict | None], old: dict | None,
+    ) -> dict | None:
+        digest, job = result
+        if job is None:
+            if old is not None and old.get("contentHash") == digest:
+                self._outcomes[posting_id] = "unchanged"
+                return old
+            return None
+        job["contentHash"] = digest
+        self._outcomes[posting_id] = "added" if old is None else "updated"
+        return job
+
+
+class IngestionWorker:
+    """Periodically pulls every source and publishes a fresh Snapshot.
+
+    Request handlers only ever read ``snapshot``; refreshes run in the
+    background and a source that fails keeps serving its previous jobs.
+    Sibling workers share published corpora through ``snapshot_path``.
+    """
+
+    def __init__(
+        self,
+        intervals: dict[str, float] | None = None,
+        snapshot_path: str | None = SNAPSHOT_PATH,
+    ):
+        self.intervals = intervals or REFRESH_INTERVALS
+        self.snapshot_path = snapshot_path
+        self.status: dict[str, SourceStatus] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._source_feeds: dict[str, list[str]] = {}
+        self._track_sources()
+        self._disk_mtime: float | None = None
+        self.crawler = Crawler(client)
+        self._last_full: dict[str, float] = {}
+        self.snapshot = Snapshot()
+        self._history: OrderedDict[int, Snapshot] = OrderedDict()
+        self._feeds: dict[str, tuple[dict, ...]] = {}
+        self._layout: list[tuple[str, int]] = []
+        self._tasks: list[asyncio.Task] = []
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._retry_at: dict[str, float] = {}
+        self._first_publish = asyncio.Event()
+        self._publishing = asyncio.Lock()
+        self._adopting = asyncio.Lock()
+
+    def _track_sources(self) -> None:
+        """Add state for sources registered since the last call."""
+        for name in SOURCES:
+            if name not in self.status:
+                self.status[name] = SourceStatus(
+                    interval=self.intervals.get(name, REFRESH_DEFAULT_SECONDS),
+                )
+                self.breakers[name] = CircuitBreaker()
+                self._source_feeds[name] = []
+
+    async def refresh(self, name: str) -> bool:
+        self._track_sources()
+        status = self.status[name]
+        if await self._adopt_disk_snapshot_async():
+            await self._publish_async()
+        if not status.is_stale():
+            return True
+        if not self.breakers[name].allow():
+            INGEST_RUNS.inc(name, "breaker_open")
+            return False
+        if not self.snapshot_path:
+            return await self._crawl(name)
+        # Workers sharing the snapshot take turns per source; whoever waited
+        # adopts what the holder published instead of fetching it again
+        async with FileLease(f"{self.snapshot_path}.{name}.lock") as lease:
+            if await self._adopt_disk_snapshot_async():
+                await self._publish_async()
+            if not status.is_stale():
+                return True
+            if time.time() - lease.last_attempt() < min(REFRESH_RETRY_SECONDS, status.interval):
+                # A sibling just tried and failed; retry on the usual backoff
+                # rather than hitting the upstream again now
+                INGEST_RUNS.inc(name, "sibling_failed")
+                return False
+            lease.mark_attempt(time.time())
+            return await self._crawl(name)
+
+    async def _crawl(self, name: str) -> bool:
+        """Fetch ``name`` and publish and persist the result."""
+        status = self.status[name]
+        breaker = self.breakers[name]
+        source = SOURCES[name]
+        status.last_attempt = time.time()
+        known = {p["id"]: p for key in self._source_feeds[name] for p in self._feeds[key]}
+        mapper = DeltaMapper(source.map, source.record_id, known)
+        full = status.last_attempt - self._last_full.get(name, 0.0) >= CRAWL_FULL_SECONDS
+        started = time.monotonic()
+        try:
+            # The source is expected to honour the timeout itself and return
+            # partial results; this only guards against one that doesn't
+            feeds = await asyncio.wait_for(
+                source.fetch(self.crawler.client(name), mapper.map_many, known, full, SOURCE_TIMEOUT_SECONDS),
+                SOURCE_TIMEOUT_SECONDS + 5,
+            )
+        except Exception as e:
+            breaker.record_failure()
+            status.last_error = repr(e)
+            logger.warning("ingestion of %s failed: %r", name, e)
+            INGEST_RUNS.inc(name, "error")
+            return False
+        elapsed = time.monotonic() - started
+        INGEST_SECONDS.observe(elapsed, name)
+        overtime = elapsed >= SOURCE_TIMEOUT_SECONDS
+        if overtime:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        INGEST_RUNS.inc(name, "partial" if overtime else "ok")
+        for key, jobs in feeds.items():
+            self._feeds[key] = tuple(jobs)
+        self._source_feeds[name] = sorted(set(self._source_feeds[name]) | set(feeds))
+        current = {p["id"] for key in self._source_feeds[name] for p in self._feeds[key]}
+        status.last_success = time.time()
+        status.last_error = None
+        if full and not overtime:
+            self._last_full[name] = status.last_attempt
+        status.jobs = len(current)
+        status.added, status.updated = mapper.added, mapper.updated
+        status.unchanged, status.removed = mapper.unchanged, len(known.keys() - current)
+        await self._publish_async()
+        await self._persist()
+        return True
+
+    async def _persist(self) -> None:
+        if not self.snapshot_path:
+            return
+        # Each worker writes its whole view, so merge in what siblings wrote
+        # since we last read the file, or their sources would be dropped
+        try:
+            async with FileLease(f"{self.snapshot_path}.lock"):
+                if await self._adopt_disk_snapshot_async():
+                    await self._publish_async()
+                await self._save()
+        except OSError as e:
+            logger.warning("could not persist snapshot to %s: %r", self.snapshot_path, e)
+
+    async def _save(self) -> None:
+        sources = {
+            name: {"lastSuccess": s.last_success, "feeds": self._source_feeds[name]}
+            for name, s in self.status.items()
+            if s.last_success is not None
+        }
+        await asyncio.to_thread(save_snapshot, self.snapshot_path, dict(self._feeds), sources)
+        self._disk_mtime = snapshot_mtime(self.snapshot_path)
+
+    def _disk_changed(self) -> bool:
+        """Whether the on-disk snapshot changed since it was last read or written."""
+        if not self.snapshot_path:
+            return False
+        mtime = snapshot_mtime(self.snapshot_path)
+        if mtime is None or mtime == self._disk_mtime:
+            return False
+        self._disk_mtime = mtime
+        return True
+
+    def adopt_disk_snapshot(self) -> bool:
+        """Take over sources that are fresher in the on-disk snapshot than in memory.
+
+        Returns True if anything was adopted, which the caller then publishes.
+        """
+        if not self._disk_changed():
+            return False
+        return self._adopt(load_snapshot(self.snapshot_path))
+
+    async def _adopt_disk_snapshot_async(self) -> bool:
+        """``adopt_disk_snapshot``, decoding the file in a thread.
+
+        Serialized, so a refresh never takes the file for already adopted
+        while another task is still reading it.
+        """
+        async with self._adopting:
+            if not self._disk_changed():
+                return False
+            return self._adopt(await asyncio.to_thread(load_snapshot, self.snapshot_path))
+
+    def _adopt(self, loaded: tuple[dict[str, list[dict]], dict[str, dict]] | None) -> bool:
+        self._track_sources()
+        if loaded is None:
+            return False
+        feeds, sources = loaded
+        held = {p["id"]: p for jobs in self._feeds.values() for p in jobs}
+
+        def reuse(p: dict) -> dict:
+            old = held.get(p["id"])
+            if old is not None and p.get("contentHash") and old.get("contentHash") == p["contentHash"]:
+                return old
+            return p
+
+        adopted = False
+        for name, info in sources.items():
+            status = self.status.get(name)
+            ts = info.get("lastSuccess")
+            if status is None or ts is None:
+                continue
+            if status.last_success is not None and status.last_success >= ts:
+                continue
+            keys = [k for k in info.get("feeds", []) if k in feeds]
+            for key in keys:
+                self._feeds[key] = tuple(reuse(p) for p in feeds[key])
+            self._source_feeds[name] = keys
+            status.last_success = ts
+            status.jobs = sum(len(self._feeds[key]) for key in keys)
+            adopted = True
+        return adopted
+
+    def _pending(self) -> tuple[list[dict], list[str], list] | None:
+        """The held feeds as postings, feed keys and layout; None if already published."""
+        postings, feeds = [], []
+        for key, jobs in self._feeds.items():
+            postings.extend(jobs)
+            feeds.extend([key] * len(jobs))
+        layout = [(key, len(jobs)) for key, jobs in self._feeds.items()]
+        if layout == self._layout and all(
+            a is b for a, b in zip(postings, self.snapshot.store.postings)
+        ):
+            return None
+        return postings, feeds, layout
+
+    @staticmethod
+    def _build(postings: list[dict], feeds: list[str], previous: Snapshot) -> Snapshot:
+        started = time.perf_counter()
+        ids = "\n".join(f'{p["id"]}:{p.get("contentHash", "")}' for p in postings).encode()
+        snapshot = Snapshot(
+            version=previous.version + 1,
+            built_at=time.time(),
+            digest=hashlib.blake2b(ids, digest_size=12).hexdigest(),
+            store=JobStore(postings, feeds, previous=previous.store),
+            index=SearchIndex(postings, previous=previous.index),
+        )
+        PUBLISH_SECONDS.observe(time.perf_counter() - started)
+        return snapshot
+
+    def _publish(self) -> bool:
+        """Publish the held feeds as a new Snapshot unless nothing changed."""
+        pending = self._pending()
+        if pending is None:
+            return False
+        postings, feeds, layout = pending
+        self._install(self._build(postings, feeds, self.snapshot), layout)
+        return True
+
+    async def _publish_async(self) -> bool:
+        """``_publish``, building a large snapshot in a thread so requests keep being served.
+
+        Publishes are serialized; one that waited picks up every feed
+        refreshed in the meantime.
+        """
+        async with self._publishing:
+            pending = self._pending()
+            if pending is None:
+                return False
+            postings, feeds, layout = pending
+            snapshot = await offload.run(
+                self._build, postings, feeds, self.snapshot,
+                size=len(postings), min_size=OFFLOAD_MIN_POSTINGS,
+            )
+            self._install(snapshot, layout)
+            return True
+
+    def _install(self, snapshot: Snapshot, layout: list) -> None:
+        self.snapshot = snapshot
+        self._layout = layout
+        self._history[self.snapshot.version] = self.snapshot
+        while len(self._history) > SNAPSHOT_HISTORY:
+            self._history.popitem(last=False)
+        self._first_publish.set()
+
+    def snapshot_with(self, digest: str) -> Snapshot | None:
+        """The newest retained snapshot of the corpus with ``digest``, if any."""
+        if self.snapshot.digest == digest:
+            return self.snapshot
+        for snapshot in reversed(self._history.values()):
+            if snapshot.digest == digest:
+                return snapshot
+        return None
+
+    def _schedule(self, name: str) -> asyncio.Task:
+        """Start a refresh of ``name`` unless one is already in flight."""
+        task = self._inflight.get(name)
+        if task is None:
+            task = asyncio.create_task(self._attempt(name))
+            self._inflight[name] = task
+            task.add_done_callback(lambda _t, n=name: self._inflight.pop(n, None))
+        return task
+
+    async def _attempt(self, name: str) -> bool:
+        """``refresh`` that never raises; a failure backs ``name`` off for a while."""
+        status = self.status[name]
+        try:
+            ok = await self.refresh(name)
+        except Exception as e:
+            # e.g. a snapshot that fails to publish or a corrupt file on disk
+            status.last_error = repr(e)
+            logger.exception("refresh of %s failed", name)
+            INGEST_RUNS.inc(name, "error")
+            ok = False
+        if ok:
+            self._retry_at.pop(name, None)
+        else:
+            self._retry_at[name] = time.time() + min(REFRESH_RETRY_SECONDS, status.interval)
+        return ok
+
+    def revalidate(self) -> None:
+        """Schedule a background refresh of every stale source not backing off, without waiting."""
+        self._track_sources()
+        now = time.time()
+        for name, status in self.status.items():
+            if status.is_stale(now) and now >= self._retry_at.get(name, 0.0):
+                self._schedule(name)
+
+    async def _run(self, name: str) -> None:
+        status = self.status[name]
+        while True:
+            if await self._schedule(name):
+                # Wake when this data goes stale, which is sooner than a full
+                # interval if it was adopted from disk
+                delay = status.interval - (time.time() - status.last_success)
+            else:
+                delay = self._retry_at[name] - time.time()
+            await asyncio.sleep(max(1.0, delay))
+
+    def start(self) -> None:
+        self._track_sources()
+        if self.adopt_disk_snapshot():
+            self._publish()
+        self._tasks = [asyncio.create_task(self._run(name)) for name in self.status]
+
+    async def wait_ready(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._first_publish.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self) -> None:
+        tasks = self._tasks + list(self._inflight.values())
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+
+    def describe(self) -> dict:
+        return {
+            "version": self.snapshot.version,
+            "builtAt": self.snapshot.built_at or None,
+            "sources": {
+                name: {**s.as_dict(), "breaker": self.breakers[name].as_dict()}
+                for name, s in self.status.items()
+            },
+            "crawler": self.crawler.describe(),
+        }
+
+
+worker = IngestionWorker()
+
+registry.gauge("matchpoint_snapshot_version", "Version of the served snapshot.", lambda: worker.snapshot.version)
+registry.gauge(
+    "matchpoint_snapshot_postings", "Postings in the served snapshot.",
+    lambda: len(worker.snapshot.store.postings),
+)
+registry.gauge(
+    "matchpoint_source_age_seconds", "Seconds since each source last refreshed.",
+    lambda: {(n,): time.time() - s.last_success for n, s in worker.status.items() if s.last_success},
+    ("source",),
+)
@@ -0,0 +1,137 @@
+import re
+
+import orjson
+
+_NESTING = re.compile(rb"[][{}]")
+_KEY = re.compile(rb'"([^"\\]*)"\s*:\s*\Z')
+_SEPARATOR = re.compile(rb"[\s,]*")
+# Where an element may end: a brace followed by the next separator
+_ELEMENT_END = re.compile(rb"\}(?=\s*[,\]])")
+
+
+class ArrayStream:
+    """Decodes the objects of one top-level array of a JSON document as it arrives.
+
+    ``feed`` returns each element of the ``key`` array as soon as it is
+    complete, so only the unfinished element is ever buffered. ``close``
+    parses what is left, the document with that array emptied, for the
+    other fields (e.g. paging links). Elements must be objects.
+    """
+
+    def __init__(self, key: str):
+        self.key = key.encode()
+        self.found = False
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_array = False
+        self._start = -1
+        self._head = b""
+
+    def feed(self, chunk: bytes) -> list[dict]:
+        self._buf += chunk
+        if self._in_array:
+            return self._elements()
+        if not self.found and self._find_array():
+            return self._elements()
+        return []
+
+    def _find_array(self) -> bool:
+        """Scan the document head up to the array, tracking nesting."""
+        buf = self._buf
+        n = len(buf)
+        pos, depth = self._pos, self._depth
+        while pos < n:
+            q = buf.find(b'"', pos)
+            head_end = 0
+            for m in _NESTING.finditer(buf, pos, n if q < 0 else q):
+                i = m.start()
+                depth += 1 if buf[i] in b"[{" else -1
+                if buf[i] == 0x5B and depth == 2 and self._is_key(buf, i):
+                    head_end = i + 1
+                    break
+            if head_end:
+                self.found = self._in_array = True
+                self._head = bytes(buf[:head_end])
+                del buf[:head_end]
+                self._pos = 0
+                return True
+            if q < 0:
+                pos = n
+                break
+            close = _string_end(buf, q + 1)
+            if close < 0:
+                pos = q  # string continues in the next chunk
+                break
+            pos = close + 1
+        self._pos, self._depth = pos, depth
+        return False
+
+    def _elements(self) -> list[dict]:
+        # An element ends at the first candidate brace that orjson accepts as
+        # the end of a complete object; braces inside strings or nested
+        # objects fail to parse and the search moves on. Scanning and
+        # parsing both run in C, which matters on multi-MB bodies.
+        buf = self._buf
+        items = []
+        pos = self._pos
+        while True:
+            if self._start < 0:
+                pos = _SEPARATOR.match(buf, pos).end()
+                if pos == len(buf):
+                    break
+                if buf[pos] == 0x5D:  # ]
+                    self._in_array = False
+                    break
+                if buf[pos] != 0x7B:
+                    raise ValueError(f"{self.key.decode()} array holds a non-object")
+                self._start = pos
+                pos += 1
+            m = _ELEMENT_END.search(buf, pos)
+            if m is None:
+                # A brace at the very end may still be followed by a separator
+                end = len(buf)
+                while end > pos and buf[end - 1] in b" \t\r\n":
+                    end -= 1
+                pos = end - 1 if end > pos and buf[end - 1] == 0x7D else len(buf)
+                break
+            pos = m.end()
+            try:
+                items.append(orjson.loads(buf[self._start:pos]))
+            except orjson.JSONDecodeError:
+                continue
+            self._start = -1
+        # Drop handed-out elements, keeping the one being read
+        keep = pos if self._start < 0 else self._start
+        del buf[:keep]
+        self._pos = pos - keep
+        if self._start >= 0:
+            self._start -= keep
+        return items
+
+    def _is_key(self, buf: bytearray, i: int) -> bool:
+        m = _KEY.search(bytes(buf[max(0, i - 128):i]))
+        return m is not None and m.group(1) == self.key
+
+    def close(self):
+        """The document without the array's elements."""
+        return orjson.loads(self._head + bytes(self._buf))
+
+
+def _string_end(buf: bytearray, i: int) -> int:
+    """Index of the quote closing a string whose contents start at ``i``; -1 if not in ``buf`` yet."""
+    while True:
+        j = buf.find(b'"', i)
+        if j < 0:
+            return j
+        k = j
+        while buf[k - 1] == 0x5C:  # backslash
+            k -= 1
+        if (j - k) % 2 == 0:
+            return j
+        i = j + 1
+
+
+def project(record: dict, fields: tuple[str, ...]) -> dict:
+    """Only the ``fields`` of ``record`` that are present."""
+    return {f: record[f] for f in fields if f in record}
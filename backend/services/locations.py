@@ -0,0 +1,88 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from config import (
+    REGIONS, LOCATION_TERMS, US_STATES, US_CITIES, WORLDWIDE_TERMS, REMOTE_TERMS,
+)
+
+# One bit per region so a set of regions is a small int and region filters
+# are a single bitwise AND over a column
+REGION_BITS = {r["id"]: 1 << i for i, r in enumerate(REGIONS)}
+ALL_REGIONS = sum(REGION_BITS.values())
+
+_TERMS = {
+    **{city: ("US", ["us"]) for city in US_CITIES},
+    **LOCATION_TERMS,
+}
+
+
+def _alternation(terms) -> re.Pattern:
+    # Longest first, so "latin america" wins over "america"
+    words = sorted(terms, key=len, reverse=True)
+    return re.compile(r"(?<![\w.])(?:" + "|".join(map(re.escape, words)) + r")(?![\w])")
+
+
+_PLACE_RE = _alternation(_TERMS)
+_WORLDWIDE_RE = _alternation(WORLDWIDE_TERMS)
+_REMOTE_RE = _alternation(REMOTE_TERMS)
+# State code after a comma, e.g. "San Francisco, CA" or "Austin, TX 78701"
+_STATE_RE = re.compile(r",\s*([A-Z]{2})\b")
+
+
+@dataclass(frozen=True)
+class Location:
+    """Structured reading of a free-text posting location.
+
+    ``country`` is an ISO code when exactly one country is named, ``state``
+    a US state code, ``regions`` a bitmask of ``REGION_BITS`` the posting is
+    open to (every region when ``worldwide``).
+    """
+    country: str = ""
+    state: str = ""
+    remote: bool = False
+    worldwide: bool = False
+    regions: int = 0
+
+    def region_ids(self) -> list[str]:
+        return [r for r, bit in REGION_BITS.items() if self.regions & bit]
+
+
+@lru_cache(maxsize=8192)
+def classify_location(location: str) -> Location:
+    """Classify a location string; memoized, as postings share few distinct strings."""
+    loc = location.lower()
+    remote = bool(_REMOTE_RE.search(loc))
+    places = [_TERMS[term] for term in _PLACE_RE.findall(loc)]
+    state = ""
+    m = _STATE_RE.search(location)
+    # A US state after the comma names the place ("Paris, TX"), unless it is
+    # the country code of the place before it ("Berlin, DE", "Toronto, CA")
+    # or a region outside the US is named
+    if m and m.group(1) in US_STATES and not any(
+        country == m.group(1) or (not country and "us" not in region_ids)
+        for country, region_ids in places
+    ):
+        state = m.group(1)
+        places = [("US", ["us"])]
+    countries, regions = set(), 0
+    for country, region_ids in places:
+        if country:
+            countries.add(country)
+        for r in region_ids:
+            regions |= REGION_BITS[r]
+    # "Worldwide" or a bare "Remote" is open to everyone, unless a region is named
+    worldwide = not regions and (remote or bool(_WORLDWIDE_RE.search(loc)))
+    if worldwide:
+        regions = ALL_REGIONS
+    country = next(iter(countries)) if len(countries) == 1 else ""
+    return Location(country, state, remote, worldwide, regions)
+
+
+def region_mask(region_ids: list[str] | None) -> int:
+    """Bitmask for the requested region ids; US only when none are valid."""
+    mask = 0
+    for r in region_ids or []:
+        mask |= REGION_BITS.get(r, 0)
+    return mask or REGION_BITS["us"]
+
@@ -0,0 +1,256 @@
+import asyncio
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Callable
+
+from config import METRICS_ENABLED, LATENCY_BUCKETS, LOOP_LAG_INTERVAL_SECONDS
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name, self.help, self.labels = name, help, labels
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, c in zip((*self.buckets, "+Inf"), counts):
+                cumulative += c
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {total:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Gauge:
+    """Read at scrape time from ``fn``: a number, or a dict of label values -> number."""
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float | dict], labels: tuple[str, ...] = ()):
+        self.name, self.help, self.fn, self.labels = name, help, fn, labels
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        value = self.fn()
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        for key, v in items:
+            lines.append(f"{self.name}{_labels(self.labels, key)} {float(v):g}")
+        return lines
+
+
+class _Noop:
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        pass
+
+    def observe(self, value: float, *labels) -> None:
+        pass
+
+
+class Registry:
+    """Process-local metrics in Prometheus text format.
+
+    When disabled, every metric handed out is a no-op and ``stage`` returns
+    a shared null context, so instrumented code costs a method call at most.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: list = []
+
+    def _add(self, metric):
+        if not self.enabled:
+            return _Noop()
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Histogram:
+        return self._add(Histogram(name, help, labels))
+
+    def gauge(self, name: str, help: str, fn: Callable, labels: tuple[str, ...] = ()) -> None:
+        self._add(Gauge(name, help, fn, labels))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry(METRICS_ENABLED)
+
+STAGE_SECONDS = registry.histogram(
+    "matchpoint_stage_seconds", "Time spent in each stage of serving a jobs request.", ("stage",),
+)
+
+# Stage timings of the current request, collected for the Server-Timing header
+_trace: ContextVar[dict[str, float] | None] = ContextVar("trace", default=None)
+_NOOP_STAGE = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        STAGE_SECONDS.observe(elapsed, self.name)
+        trace = _trace.get()
+        if trace is not None:
+            trace[self.name] = trace.get(self.name, 0.0) + elapsed
+
+
+def stage(name: str):
+    """Time a block as pipeline stage ``name``: ``with stage("rank"): ...``."""
+    if registry.enabled or _trace.get() is not None:
+        return _Stage(name)
+    return _NOOP_STAGE
+
+
+def start_trace() -> dict[str, float]:
+    """Collect this request's stage timings into the returned dict."""
+    trace: dict[str, float] = {}
+    _trace.set(trace)
+    return trace
+
+
+def server_timing(trace: dict[str, float], total: float) -> str:
+    parts = [f"{name};dur={secs * 1000:.2f}" for name, secs in trace.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+HTTP_SECONDS = registry.histogram(
+    "matchpoint_http_request_seconds", "Time to serve an API request.", ("method", "route", "status"),
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every request, optionally adding a Server-Timing header."""
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        trace = start_trace() if self.server_timing else None
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trace is not None:
+                    header = server_timing(trace, time.perf_counter() - start).encode()
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header)]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Label by route template so ids in paths don't explode cardinality
+            route = scope.get("route")
+            HTTP_SECONDS.observe(
+                time.perf_counter() - start, scope["method"],
+                getattr(route, "path", "unmatched"), status,
+            )
+
+
+LOOP_LAG = registry.histogram(
+    "matchpoint_event_loop_lag_seconds", "How late the event loop resumed a sleeping task.",
+)
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag: how much later than asked a sleep returns.
+
+    Anything holding the loop (CPU-bound work in a handler or refresh) shows
+    up as lag, which every other in-flight request waits through too.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SECONDS):
+        self.interval = interval
+        self.samples: list[float] = []
+        self.max = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            LOOP_LAG.observe(lag)
+            self.max = max(self.max, lag)
+            self.samples.append(lag)
+            if len(self.samples) > 4096:
+                del self.samples[:2048]
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+loop_lag = LoopLagMonitor()
+registry.gauge("matchpoint_event_loop_lag_max_seconds", "Worst event-loop lag seen.", lambda: loop_lag.max)
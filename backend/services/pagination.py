@@ -0,0 +1,36 @@
+import base64
+import json
+import zlib
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def fingerprint(query: str, categories: list[str], skills: list[str], filters: dict) -> int:
+    """Checksum of the request parameters a cursor is only valid for."""
+    raw = json.dumps([query, sorted(categories), sorted(skills), filters], sort_keys=True)
+    return zlib.crc32(raw.encode())
+
+
+def encode_cursor(digest: str, offset: int, fp: int) -> str:
+    raw = json.dumps({"d": digest, "o": offset, "f": fp}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, fp: int) -> tuple[str, int]:
+    """Return ``(snapshot digest, offset)`` from an opaque cursor.
+
+    The digest names the corpus the first page was ranked from; it is the
+    same on every worker holding that corpus, unlike its version.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        digest, offset, cursor_fp = data["d"], int(data["o"]), data["f"]
+    except (ValueError, TypeError, KeyError, OverflowError):
+        raise InvalidCursor("malformed cursor")
+    if not isinstance(digest, str):
+        raise InvalidCursor("malformed cursor")
+    if cursor_fp != fp or offset < 0:
+        raise InvalidCursor("cursor does not belong to this query")
+    return digest, offset
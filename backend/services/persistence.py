@@ -0,0 +1,125 @@
+import asyncio
+import mmap
+import os
+import struct
+import tempfile
+
+import orjson
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process coordination
+    fcntl = None
+
+# File layout: fixed header, JSON manifest, then one orjson array per feed.
+# Bump FORMAT_VERSION whenever the posting shape changes; files written by
+# another version are ignored and the worker starts cold instead.
+MAGIC = b"MPSNAP"
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<6sHI")
+
+
+def save_snapshot(path: str, feeds: dict[str, tuple[dict, ...]], sources: dict[str, dict]) -> None:
+    """Write the corpus to ``path`` atomically.
+
+    ``sources`` maps each source name to ``{"lastSuccess": ts, "feeds": [keys]}``.
+    The file is written next to ``path`` and moved into place with
+    ``os.replace``, so readers see either the old or the new snapshot, never
+    a partial one.
+    """
+    bodies, offsets, pos = [], {}, 0
+    for key, jobs in feeds.items():
+        body = orjson.dumps(jobs)
+        offsets[key] = [pos, len(body)]
+        bodies.append(body)
+        pos += len(body)
+    manifest = orjson.dumps({"sources": sources, "feeds": offsets})
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(manifest)))
+            f.write(manifest)
+            for body in bodies:
+                f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def load_snapshot(path: str) -> tuple[dict[str, list[dict]], dict[str, dict]] | None:
+    """Read a snapshot written by ``save_snapshot``; None if missing, foreign or corrupt."""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, manifest_len = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            start = _HEADER.size + manifest_len
+            manifest = orjson.loads(mm[_HEADER.size:start])
+            feeds = {
+                key: orjson.loads(mm[start + offset:start + offset + length])
+                for key, (offset, length) in manifest["feeds"].items()
+            }
+            return feeds, manifest["sources"]
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+
+def snapshot_mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class FileLease:
+    """Exclusive lease shared by processes on one host: a flock on ``path``.
+
+    The file can also record when a holder last attempted its work, so a
+    process that waited for the lease can tell a sibling just tried.
+    """
+
+    def __init__(self, path: str, poll: float = 0.25):
+        self.path = path
+        self.poll = poll
+        self._fd: int | None = None
+
+    async def __aenter__(self) -> "FileLease":
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Polled rather than blocking, so waiting doesn't tie up a thread
+            while fcntl is not None:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(self.poll)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        os.close(self._fd)  # closing releases the lock
+        self._fd = None
+
+    def last_attempt(self) -> float:
+        try:
+            return float(os.pread(self._fd, 32, 0) or 0)
+        except ValueError:
+            return 0.0
+
+    def mark_attempt(self, ts: float) -> None:
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, repr(ts).encode(), 0)
@@ -1,19 +1,35 @@
 import re
+from typing import Awaitable, Callable
 
-import aiohttp
-from config import REMOTIVE_URL, REMOTIVE_LIMIT
-from utils import title_case, parse_salary_min, days_ago, fmt_type, logo_url
-from services.scoring import score_match, get_matched
+from config import REMOTIVE_URL, REMOTIVE_LIMIT, CATEGORIES
+from utils import (
+    title_case, parse_salary_min, parse_timestamp, days_since, fmt_type, logo_url, text_snippet,
+)
 from services.linkedin_url import generate_linkedin_search_url
+from services.http_client import HttpClient
+from services.crawler import CrawlError, gather_within
+from services.executor import inline_batches
+from services.jsonstream import project
 
+# Record fields map_remotive reads; the rest are dropped as records arrive
+REMOTIVE_FIELDS = (
+    "id", "title", "company_name", "company_logo", "candidate_required_location", "salary",
+    "publication_date", "description", "tags", "url", "job_type", "category",
+)
 
-def map_remotive(r: dict, user_skills: list[str]) -> dict:
+
+def remotive_id(r: dict) -> str:
+    return f"rm-{r.get('id', '')}"
+
+
+def map_remotive(r: dict) -> dict:
     tags = [title_case(t.strip()) for t in (r.get("tags") or []) if t.strip()]
     title = (r.get("title") or "").strip()
     title = re.sub(r"\s*\[.*?\]", "", title).strip() or "Untitled"
     company = r.get("company_name") or "Unknown"
+    posted_at = parse_timestamp(r.get("publication_date"))
     return {
-        "id": f"rm-{r.get('id', '')}",
+        "id": remotive_id(r),
         "title": title,
         "company": company,
         "logo": logo_url(company, r.get("company_logo", "")),
@@ -21,12 +37,13 @@ def map_remotive(r: dict, user_skills: list[str]) -> dict:
         "locationType": "remote",
         "salary": r.get("salary") or "",
         "salaryMin": parse_salary_min(r.get("salary") or ""),
-        "match": score_match(tags, user_skills),
-        "postedDays": days_ago(r.get("publication_date") or ""),
+        "postedDays": days_since(posted_at),
+        "postedAt": posted_at,
         "description": r.get("description") or "",
+        "snippet": text_snippet(r.get("description") or ""),
         "isHtml": True,
         "skills": tags[:6],
-        "userSkillMatch": get_matched(tags, user_skills)[:6],
+        "tags": tags,
         "url": r.get("url") or "",
         "jobType": fmt_type(r.get("job_type") or ""),
         "category": r.get("category") or "",
@@ -36,18 +53,42 @@ def map_remotive(r: dict, user_skills: list[str]) -> dict:
 
 
 async def fetch_remotive(
-    session: aiohttp.ClientSession,
-    query: str,
+    client: HttpClient,
     category: str,
-    user_skills: list[str],
+    mapper: Callable[[list[dict]], Awaitable[list[dict | None]]] = inline_batches(map_remotive),
 ) -> list[dict]:
     params = {"limit": str(REMOTIVE_LIMIT)}
-    if query:
-        params["search"] = query
     if category:
         params["category"] = category
-    async with session.get(REMOTIVE_URL, params=params) as resp:
-        if resp.status != 200:
-            return []
-        data = await resp.json()
-        return [map_remotive(r, user_skills) for r in (data.get("jobs") or [])]
+    status, jobs, _ = await client.get_items(
+        REMOTIVE_URL, params, "jobs", lambda rs: mapper([project(r, REMOTIVE_FIELDS) for r in rs]),
+    )
+    if status != 200:
+        raise CrawlError(f"GET {REMOTIVE_URL} returned {status}")
+    return jobs
+
+
+class RemotiveSource:
+    """One feed per Remotive category, fetched in parallel."""
+
+    name = "remotive"
+    record_id = staticmethod(remotive_id)
+    map = staticmethod(map_remotive)
+
+    async def fetch(
+        self,
+        client: HttpClient,
+        mapper: Callable[[list[dict]], Awaitable[list[dict | None]]],
+        held: dict[str, dict],
+        full: bool,
+        timeout: float,
+    ) -> dict[str, list[dict]]:
+        # Categories that fail or run late are left out and keep their
+        # previous postings
+        results = await gather_within(
+            {f"remotive:{c['id']}": fetch_remotive(client, c["id"], mapper) for c in CATEGORIES},
+            timeout,
+        )
+        if not results:
+            raise RuntimeError("no remotive category finished")
+        return results
@@ -1,13 +1,84 @@
-import random
+import re
+from functools import lru_cache
 
+import numpy as np
 
-def score_match(tags: list[str], user_skills: list[str]) -> int:
-    if not tags:
-        return 70 + random.randint(0, 19)
-    matched = [t for t in tags if any(s in t.lower() for s in user_skills)]
-    raw = round((len(matched) / len(tags)) * 40 + random.random() * 25 + 35)
-    return max(60, min(99, raw))
+from config import (
+    RANK_SKILL_WEIGHT, RANK_RECENCY_WEIGHT, RANK_SALARY_WEIGHT, RANK_RECENCY_HALF_LIFE_DAYS,
+    RANK_UNTAGGED_SKILL,
+)
+
+
+def score_array(skill, days, has_salary) -> np.ndarray:
+    """Match scores in [60, 99] from skill similarity, age and salary presence.
+
+    ``skill`` is the share of a posting's tags covered by the user's skills,
+    in [0, 1]; recency halves every ``RANK_RECENCY_HALF_LIFE_DAYS``. Scores
+    stay floats for ordering and are rounded for display. Nothing random
+    goes in, so a posting scores the same on every request and pages of a
+    ranking stay stable.
+    """
+    recency = 0.5 ** (np.asarray(days, dtype=np.float64) / RANK_RECENCY_HALF_LIFE_DAYS)
+    blend = (
+        RANK_SKILL_WEIGHT * np.asarray(skill, dtype=np.float64)
+        + RANK_RECENCY_WEIGHT * recency
+        + RANK_SALARY_WEIGHT * np.asarray(has_salary, dtype=np.float64)
+    )
+    return 60 + 39 * blend
+
+
+class SkillMatcher:
+    """Matches tags against one skill set in a single pass.
+
+    A tag matches when any skill is a substring of the lowercased tag. All
+    skills are compiled into one alternation regex, and results are memoized
+    per tag since the same tags recur across most postings.
+    """
+
+    def __init__(self, skills: frozenset[str]):
+        self.skills = skills
+        alternation = "|".join(re.escape(s) for s in sorted(skills, key=len, reverse=True))
+        self._pattern = re.compile(alternation) if skills else None
+        self._memo: dict[str, bool] = {}
+
+    def is_match(self, tag: str) -> bool:
+        hit = self._memo.get(tag)
+        if hit is None:
+            hit = self._pattern is not None and self._pattern.search(tag.lower()) is not None
+            self._memo[tag] = hit
+        return hit
+
+    def matched(self, tags: list[str]) -> list[str]:
+        return [t for t in tags if self.is_match(t)]
+
+    @property
+    def untagged_skill(self) -> float:
+        """Skill similarity of a posting without tags; nothing to go on without skills either."""
+        return RANK_UNTAGGED_SKILL if self.skills else 0.0
+
+    def score(
+        self, tags: list[str], posted_days: int = 0, has_salary: bool = False,
+    ) -> tuple[int, list[str]]:
+        """Return ``(match score, matched tags)`` for one posting, all tags weighted alike."""
+        matched = self.matched(tags)
+        skill = len(matched) / len(tags) if tags else self.untagged_skill
+        return round(float(score_array(skill, posted_days, has_salary))), matched
+
+
+@lru_cache(maxsize=256)
+def _matcher_for(skills: frozenset[str]) -> SkillMatcher:
+    return SkillMatcher(skills)
+
+
+def get_matcher(user_skills: list[str]) -> SkillMatcher:
+    return _matcher_for(frozenset(user_skills))
+
+
+def score_match(
+    tags: list[str], user_skills: list[str], posted_days: int = 0, has_salary: bool = False,
+) -> int:
+    return get_matcher(user_skills).score(tags, posted_days, has_salary)[0]
 
 
 def get_matched(tags: list[str], user_skills: list[str]) -> list[str]:
-    return [t for t in tags if any(s in t.lower() for s in user_skills)]
+    return get_matcher(user_skills).matched(tags)
@@ -0,0 +1,110 @@
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+from config import SEARCH_FIELD_WEIGHTS, SEARCH_PREFIX_EXPANSIONS
+from utils import strip_html
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[+#]+|\.[a-z0-9]+)*")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _field_text(job: dict, field: str) -> str:
+    if field == "tags":
+        return " ".join(job["tags"])
+    if field == "description":
+        return strip_html(job["description"])
+    return job[field]
+
+
+def _doc_terms(job: dict) -> tuple[float, dict[str, float]]:
+    """Weighted length and per-term weighted frequency of one posting."""
+    length = 0.0
+    counts: dict[str, float] = {}
+    for field, weight in SEARCH_FIELD_WEIGHTS.items():
+        tokens = tokenize(_field_text(job, field))
+        length += weight * len(tokens)
+        for tok in tokens:
+            counts[tok] = counts.get(tok, 0.0) + weight
+    return length, counts
+
+
+class SearchIndex:
+    """In-memory inverted index over postings with BM25 ranking.
+
+    Title, company, tags and description are indexed with per-field weights
+    (a BM25F-style weighted term frequency). Every query token must match,
+    either exactly or as a prefix of an indexed term, so partially typed
+    words such as "eng" still find "engineer".
+
+    Tokenizing is the expensive part of a build, so per-posting term counts
+    are kept in ``doc_terms`` (keyed by id and content hash) and reused by
+    the next build via ``previous``.
+    """
+
+    def __init__(self, postings: list[dict], previous: "SearchIndex | None" = None):
+        self.size = len(postings)
+        cached = previous.doc_terms if previous is not None else {}
+        self.doc_terms: dict[tuple, tuple[float, dict[str, float]]] = {}
+        tf: dict[str, dict[int, float]] = defaultdict(dict)
+        lengths = np.zeros(self.size, dtype=np.float32)
+        for doc, job in enumerate(postings):
+            key = (job["id"], job.get("contentHash"))
+            entry = cached.get(key) if key[1] else None
+            if entry is None:
+                entry = _doc_terms(job)
+            if key[1]:
+                self.doc_terms[key] = entry
+            lengths[doc], counts = entry
+            for tok, weight in counts.items():
+                tf[tok][doc] = weight
+
+        avg_len = float(lengths.mean()) if self.size else 0.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / (avg_len or 1.0))
+        self._terms = sorted(tf)
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for term, counts in tf.items():
+            docs = np.fromiter(counts, dtype=np.int64, count=len(counts))
+            freqs = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            idf = math.log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            weights = idf * freqs * (BM25_K1 + 1) / (freqs + norm[docs])
+            self._postings[term] = (docs, weights.astype(np.float32))
+
+    def _expand(self, token: str) -> list[str]:
+        start = bisect_left(self._terms, token)
+        terms = []
+        for term in self._terms[start:start + SEARCH_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query: str) -> np.ndarray | None:
+        """BM25 score per document; 0 for documents that miss any query token.
+
+        Returns None when the query has no searchable tokens.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return None
+        total = np.zeros(self.size, dtype=np.float32)
+        matched = np.ones(self.size, dtype=np.bool_)
+        for tok in tokens:
+            scores = np.zeros(self.size, dtype=np.float32)
+            for term in self._expand(tok):
+                docs, weights = self._postings[term]
+                # Prefix expansions score lower than an exact hit
+                scores[docs] += weights if term == tok else weights * 0.5
+            matched &= scores > 0
+            total += scores
+        total[~matched] = 0
+        return total
@@ -0,0 +1,83 @@
+import hashlib
+import logging
+from typing import Callable, Iterable
+
+import orjson
+from pydantic import ValidationError
+
+from config import SUMMARY_SKILLS
+from models import JobDetail, JobSummary
+
+logger = logging.getLogger(__name__)
+
+# Summary fields that depend on the requesting user or the current time,
+# appended per request
+_REQUEST_FIELDS = ("match", "userSkillMatch", "postedDays")
+_SUMMARY_FIELDS = tuple(f for f in JobSummary.model_fields if f not in _REQUEST_FIELDS)
+_DETAIL_FIELDS = tuple(JobDetail.model_fields)
+
+
+def validate_posting(job: dict) -> dict | None:
+    """Validate a freshly mapped posting once; None if it doesn't fit the models.
+
+    Everything downstream (caching, ranking, encoding) trusts these dicts,
+    so responses are encoded directly instead of re-validated per request.
+    """
+    try:
+        detail = JobDetail.model_validate(job)
+    except ValidationError as e:
+        logger.warning("dropping invalid posting %s: %s", job.get("id"), e)
+        return None
+    return {**job, **detail.model_dump()}
+
+
+def content_hash(record: dict) -> str:
+    return hashlib.blake2b(orjson.dumps(record, option=orjson.OPT_SORT_KEYS), digest_size=8).hexdigest()
+
+
+def map_posting(
+    map_fn: Callable[[dict], dict], item: tuple[dict, str | None],
+) -> tuple[str, dict | None]:
+    """Hash a raw record and, unless that matches the held hash, map and validate it.
+
+    ``item`` is ``(record, held_hash)``; returns ``(hash, posting)`` with a
+    None posting when unchanged or invalid. Module-level so process pools
+    can run it.
+    """
+    record, held_hash = item
+    digest = content_hash(record)
+    if digest == held_hash:
+        return digest, None
+    return digest, validate_posting(map_fn(record))
+
+
+def summary_prefix(job: dict) -> bytes:
+    """The static part of a job's summary JSON, left open for the per-request fields."""
+    fields = {f: job[f] for f in _SUMMARY_FIELDS if f in job}
+    fields["skills"] = job["skills"][:SUMMARY_SKILLS]
+    return orjson.dumps(fields)[:-1]
+
+
+def encode_summary(prefix: bytes, match: int, matched: list[str], posted_days: int) -> bytes:
+    return b"".join((
+        prefix, b',"match":', str(match).encode(),
+        b',"userSkillMatch":', orjson.dumps(matched),
+        b',"postedDays":', str(posted_days).encode(), b"}",
+    ))
+
+
+def encode_detail(job: dict, posted_days: int) -> bytes:
+    fields = {f: job[f] for f in _DETAIL_FIELDS if f in job}
+    fields["postedDays"] = posted_days
+    return orjson.dumps(fields)
+
+
+def encode_jobs_response(
+    jobs: Iterable[bytes], total: int, cached: bool, next_cursor: str | None,
+) -> bytes:
+    """Assemble a JobsResponse body from pre-encoded job fragments."""
+    return b"".join((
+        b'{"jobs":[', b",".join(jobs), b'],"total":', str(total).encode(),
+        b',"cached":', b"true" if cached else b"false",
+        b',"nextCursor":', orjson.dumps(next_cursor), b"}",
+    ))
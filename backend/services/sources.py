@@ -0,0 +1,49 @@
+from typing import Awaitable, Callable, Protocol
+
+from services.http_client import HttpClient
+from services.remotive import RemotiveSource
+from services.arbeitnow import ArbeitnowSource
+
+
+class JobSource(Protocol):
+    """An upstream job board crawled by the ingestion worker.
+
+    ``record_id`` and ``map`` turn one raw upstream record into its posting
+    id and posting dict (None drops the record). ``fetch`` crawls the board,
+    passes the raw records through ``mapper`` (which wraps ``map``) in
+    batches and returns the mapped postings per feed key, e.g.
+    ``remotive:design``.
+
+    ``held`` is what the worker already holds from this source, by posting
+    id; a crawl that is not ``full`` may stop once it reaches postings it
+    already holds, keeping the rest of ``held``. ``fetch`` should return
+    within ``timeout`` seconds with whatever it has by then, and raise if it
+    has nothing.
+    """
+
+    name: str
+
+    def record_id(self, r: dict) -> str: ...
+
+    def map(self, r: dict) -> dict | None: ...
+
+    async def fetch(
+        self,
+        client: HttpClient,
+        mapper: Callable[[list[dict]], Awaitable[list[dict | None]]],
+        held: dict[str, dict],
+        full: bool,
+        timeout: float,
+    ) -> dict[str, list[dict]]: ...
+
+
+SOURCES: dict[str, JobSource] = {}
+
+
+def register(source: JobSource) -> JobSource:
+    SOURCES[source.name] = source
+    return source
+
+
+register(RemotiveSource())
+register(ArbeitnowSource())
@@ -0,0 +1,259 @@
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+
+from config import SEARCH_BLEND, RANK_CACHED_SKILL_SETS
+from services.scoring import SkillMatcher, score_array
+from services.dedup import find_duplicates
+from services.locations import classify_location
+from services.serialization import summary_prefix, encode_summary
+from utils import fmt_type
+
+
+def _encode(values: list[str]) -> tuple[np.ndarray, dict[str, int]]:
+    """Dictionary-encode strings into int codes plus the value -> code vocabulary."""
+    vocab: dict[str, int] = {}
+    codes = np.fromiter(
+        (vocab.setdefault(v, len(vocab)) for v in values), dtype=np.int32, count=len(values),
+    )
+    return codes, vocab
+
+
+def top_k(scores: np.ndarray, limit: int | None = None) -> np.ndarray:
+    """Positions of the highest scores, best first, ties kept in input order."""
+    n = len(scores)
+    if limit is not None and limit < n:
+        # Partition on the k-th score, then stable-sort only the candidates
+        kth = np.partition(scores, n - limit)[n - limit]
+        candidates = np.flatnonzero(scores >= kth)
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return order[:limit]
+    return np.argsort(-scores, kind="stable")
+
+
+class JobStore:
+    """Columnar view of a posting list for vectorized filtering and ranking.
+
+    Numeric fields are NumPy arrays and string fields are dictionary-encoded,
+    so every filter in a request folds into one boolean mask. Tags are kept
+    CSR-style (``tag_ids[tag_offsets[i]:tag_offsets[i + 1]]`` for row ``i``)
+    so skill matching runs once per distinct tag rather than per posting.
+    Each posting also has a sparse skill vector, stored inverted (the rows
+    and weights of each tag) so ranking only touches postings with a
+    matching tag.
+    Posting dicts are only touched for the rows finally returned.
+    """
+
+    def __init__(
+        self,
+        postings: list[dict],
+        feeds: list[str] | None = None,
+        previous: "JobStore | None" = None,
+    ):
+        self.postings = postings
+        self.row_by_id = {j["id"]: i for i, j in enumerate(postings)}
+        n = len(postings)
+        # Encoded summary JSON per row, filled in the first time a row is served
+        # and carried over from ``previous`` for postings that didn't change
+        self._prefixes: list[bytes | None] = [None] * n
+        if previous is not None:
+            for i, j in enumerate(postings):
+                row = previous.row_by_id.get(j["id"])
+                if row is not None and previous.postings[row] is j:
+                    self._prefixes[i] = previous._prefixes[row]
+        self.salary_min = np.fromiter((j["salaryMin"] for j in postings), dtype=np.int64, count=n)
+        # Ages are derived from postedAt at read time; postedDays is only used
+        # for postings without a timestamp
+        self.posted_at = np.fromiter(
+            (np.nan if j.get("postedAt") is None else j["postedAt"] for j in postings),
+            dtype=np.float64, count=n,
+        )
+        self._static_days = np.fromiter((j["postedDays"] for j in postings), dtype=np.int32, count=n)
+        self.has_salary = np.fromiter((bool(j["salary"]) for j in postings), dtype=np.bool_, count=n)
+        self.job_type, self.job_type_codes = _encode([j["jobType"] for j in postings])
+        self.source, self.source_codes = _encode([j["source"] for j in postings])
+        self.category, self.category_codes = _encode([j["category"] for j in postings])
+        self.feed, self.feed_codes = _encode(feeds if feeds is not None else [""] * n)
+        # Locations are classified once per distinct string, then broadcast
+        self.location, location_vocab = _encode([j["location"] for j in postings])
+        self.region_bits = np.fromiter(
+            (classify_location(v).regions for v in location_vocab),
+            dtype=np.int32, count=len(location_vocab),
+        )[self.location]
+        flat_tags = [t for j in postings for t in j["tags"]]
+        self.tag_ids, tag_vocab = _encode(flat_tags)
+        self.tags = list(tag_vocab)
+        self.tag_counts = np.fromiter((len(j["tags"]) for j in postings), dtype=np.int32, count=n)
+        self.tag_offsets = np.concatenate(([0], np.cumsum(self.tag_counts)))
+        # Rarer tags weigh more (smoothed idf) and each row's weights sum to 1,
+        # so similarity to a skill set is the weighted share of tags it covers
+        idf = np.log1p(n / np.maximum(np.bincount(self.tag_ids, minlength=len(self.tags)), 1))
+        weights = idf[self.tag_ids]
+        weights /= np.repeat(self._row_sums(weights), self.tag_counts)
+        by_tag = np.argsort(self.tag_ids, kind="stable")
+        self._tag_rows = np.repeat(np.arange(n, dtype=np.int32), self.tag_counts)[by_tag]
+        self._tag_weights = weights[by_tag]
+        self._tag_starts = np.searchsorted(self.tag_ids[by_tag], np.arange(len(self.tags) + 1))
+        self._similarity: dict[frozenset[str], np.ndarray] = {}
+        self.duplicates = find_duplicates(
+            postings, previous.duplicates if previous is not None else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    def summary_prefix(self, row: int) -> bytes:
+        prefix = self._prefixes[row]
+        if prefix is None:
+            prefix = self._prefixes[row] = summary_prefix(self.postings[row])
+        return prefix
+
+    def posted_days(self, rows: np.ndarray, now: float | None = None) -> np.ndarray:
+        now = time.time() if now is None else now
+        at = self.posted_at[rows]
+        with np.errstate(invalid="ignore"):
+            days = np.maximum(0, np.floor((now - at) / 86400))
+        return np.where(np.isnan(at), self._static_days[rows], days).astype(np.int32)
+
+    def rows_in_feeds(self, feeds: list[str]) -> np.ndarray:
+        codes = [self.feed_codes[f] for f in feeds if f in self.feed_codes]
+        return np.flatnonzero(np.isin(self.feed, codes))
+
+    def in_regions(self, rows: np.ndarray, regions: int) -> np.ndarray:
+        """Rows open to any of the regions in the ``REGION_BITS`` mask."""
+        return rows[(self.region_bits[rows] & regions) != 0]
+
+    def _codes(self, vocab: dict[str, int], values) -> list[int]:
+        return [vocab[v] for v in values if v in vocab]
+
+    def filter(self, rows: np.ndarray, filters: dict) -> np.ndarray:
+        return rows[self.mask(rows, filters)]
+
+    def mask(self, rows: np.ndarray, filters: dict) -> np.ndarray:
+        mask = np.ones(len(rows), dtype=np.bool_)
+
+        # Minimum salary filter
+        min_sal = filters.get("minSalary", 0)
+        if min_sal > 0:
+            mask &= self.salary_min[rows] >= min_sal
+
+        # Job type filter
+        jt_ids = filters.get("jobTypes") or []
+        if jt_ids:
+            allowed = self._codes(self.job_type_codes, {fmt_type(t) for t in jt_ids})
+            mask &= np.isin(self.job_type[rows], allowed)
+
+        # Existing boolean filters (from StackView quick-filter pills)
+        if filters.get("fulltime"):
+            mask &= np.isin(self.job_type[rows], self._codes(self.job_type_codes, ["Full-time"]))
+        if filters.get("salary"):
+            mask &= self.has_salary[rows]
+        if filters.get("recent"):
+            mask &= self.posted_days(rows) <= 7
+        return mask
+
+    def _row_sums(self, values: np.ndarray) -> np.ndarray:
+        """Per-row sums of ``values`` aligned with ``tag_ids``."""
+        cum = np.concatenate(([0], np.cumsum(values)))
+        return cum[self.tag_offsets[1:]] - cum[self.tag_offsets[:-1]]
+
+    def skill_similarity(self, matcher: SkillMatcher) -> np.ndarray:
+        """Similarity in [0, 1] of ``matcher``'s skills to every row in the store.
+
+        The skill set is a 0/1 query vector over the tag vocabulary, so its
+        dot product with each row's vector sums the weights listed under the
+        matching tags. Results are kept per skill set, since users send theirs
+        on every request; callers must not modify them.
+        """
+        sim = self._similarity.get(matcher.skills)
+        if sim is None:
+            starts = self._tag_starts
+            spans = [
+                slice(starts[i], starts[i + 1])
+                for i, t in enumerate(self.tags) if matcher.is_match(t)
+            ]
+            if spans:
+                sim = np.bincount(
+                    np.concatenate([self._tag_rows[s] for s in spans]),
+                    weights=np.concatenate([self._tag_weights[s] for s in spans]),
+                    minlength=len(self),
+                ).astype(np.float32)
+            else:
+                sim = np.zeros(len(self), dtype=np.float32)
+            sim[self.tag_counts == 0] = matcher.untagged_skill
+            if len(self._similarity) >= RANK_CACHED_SKILL_SETS:
+                self._similarity.clear()
+            self._similarity[matcher.skills] = sim
+        return sim
+
+    def rank(
+        self,
+        rows: np.ndarray,
+        matcher: SkillMatcher,
+        filters: dict,
+        offset: int = 0,
+        limit: int | None = None,
+        relevance: np.ndarray | None = None,
+    ) -> "Ranking":
+        """Filter ``rows``, score them for ``matcher`` and pick one page of the best.
+
+        ``relevance`` (aligned with ``rows``) is a query relevance score that
+        is blended into the ordering; the reported ``match`` stays the skill
+        match. Ordering is deterministic, so consecutive offsets page through
+        the same ranking.
+        """
+        keep = self.mask(rows, filters)
+        rows = rows[keep]
+        if not len(rows):
+            return Ranking(self, matcher, 0, rows, rows, rows)
+        days = self.posted_days(rows)
+        scores = score_array(self.skill_similarity(matcher)[rows], days, self.has_salary[rows])
+        key = scores
+        if relevance is not None:
+            relevance = relevance[keep]
+            top = float(relevance.max())
+            if top > 0:
+                key = (1 - SEARCH_BLEND) * scores + SEARCH_BLEND * 100 * relevance / top
+        end = None if limit is None else offset + limit
+        order = top_k(key, end)[offset:end]
+        page = rows[order]
+        return Ranking(
+            self, matcher, len(rows), page, np.rint(scores[order]).astype(np.int32), days[order],
+        )
+
+
+@dataclass
+class Ranking:
+    """One page of ranked rows; postings are copied lazily on iteration."""
+    store: JobStore
+    matcher: SkillMatcher
+    total: int
+    rows: np.ndarray
+    scores: np.ndarray
+    posted_days: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _items(self):
+        return zip(self.rows.tolist(), self.scores.tolist(), self.posted_days.tolist())
+
+    def __iter__(self) -> Iterator[dict]:
+        postings = self.store.postings
+        for row, match, days in self._items():
+            p = postings[row]
+            yield {
+                **p,
+                "match": match,
+                "userSkillMatch": self.matcher.matched(p["tags"])[:6],
+                "postedDays": days,
+            }
+
+    def encoded(self) -> Iterator[bytes]:
+        """Summary JSON per job, built from the store's cached per-row prefixes."""
+        postings = self.store.postings
+        for row, match, days in self._items():
+            matched = self.matcher.matched(postings[row]["tags"])[:6]
+            yield encode_summary(self.store.summary_prefix(row), match, matched, days)
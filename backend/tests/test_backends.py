@@ -0,0 +1,101 @@
+import asyncio
+
+import numpy as np
+import pytest
+from fakeredis import aioredis
+
+from services import aggregator
+from services.backends import MemoryBackend, RedisBackend
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def redis_backend():
+    return RedisBackend(aioredis.FakeRedis(), prefix="test:")
+
+
+def test_redis_round_trip(redis_backend):
+    async def go():
+        await redis_backend.set("a", b"1")
+        assert await redis_backend.get("a") == b"1"
+        assert await redis_backend.get_many(["a", "missing"]) == [b"1", None]
+        assert await redis_backend.pop("a") == b"1"
+        assert await redis_backend.pop("a") is None
+        await redis_backend.close()
+
+    run(go())
+
+
+def test_redis_keys_are_prefixed():
+    client = aioredis.FakeRedis()
+
+    async def go():
+        await RedisBackend(client, prefix="p:").set("k", b"v")
+        assert await client.get("p:k") == b"v"
+        assert await client.get("k") is None
+
+    run(go())
+
+
+def test_redis_set_many_is_one_transaction(redis_backend):
+    async def go():
+        await redis_backend.set_many({"ids": b"x\ny", "rel": b"\0\0\0\0"}, ttl=30)
+        assert await redis_backend.get_many(["ids", "rel"]) == [b"x\ny", b"\0\0\0\0"]
+        client = redis_backend._client
+        for key in ("test:ids", "test:rel"):
+            assert 0 < await client.pttl(key) <= 30_000
+
+    run(go())
+
+
+def test_redis_ttl_expires(redis_backend):
+    async def go():
+        await redis_backend.set("short", b"1", ttl=0.05)
+        await asyncio.sleep(0.1)
+        assert await redis_backend.get("short") is None
+
+    run(go())
+
+
+def test_memory_set_many():
+    backend = MemoryBackend()
+
+    async def go():
+        await backend.set_many({"a": b"1", "b": b"2"})
+        assert await backend.get_many(["a", "b", "c"]) == [b"1", b"2", None]
+
+    run(go())
+
+
+class _Store:
+    def __init__(self, ids):
+        self.postings = [{"id": i} for i in ids]
+        self.row_by_id = {i: n for n, i in enumerate(ids)}
+
+
+class _Snapshot:
+    digest = "d1"
+
+    def __init__(self, ids):
+        self.store = _Store(ids)
+
+
+def test_shared_entry_round_trip(redis_backend, monkeypatch):
+    monkeypatch.setattr(aggregator, "backend", redis_backend)
+    snapshot = _Snapshot(["a", "b", "c", "d"])
+    rows = np.array([3, 1], dtype=np.int64)
+    relevance = np.array([0.5, 0.25], dtype=np.float32)
+
+    async def go():
+        await aggregator._store_shared(snapshot, "q|all|0", rows, relevance)
+        loaded_rows, loaded_rel = await aggregator._load_shared(snapshot, "q|all|0")
+        assert loaded_rows.tolist() == [3, 1]
+        assert loaded_rel.tolist() == [0.5, 0.25]
+        await aggregator._store_shared(snapshot, "|all|0", rows, None)
+        loaded_rows, loaded_rel = await aggregator._load_shared(snapshot, "|all|0")
+        assert loaded_rows.tolist() == [3, 1] and loaded_rel is None
+
+    run(go())
@@ -0,0 +1,91 @@
+import orjson
+import pytest
+
+from services.jsonstream import ArrayStream
+
+JOBS = [
+    {"id": 1, "title": 'Say "hi"', "tags": ["a", "b"]},
+    {"id": 2, "title": "brace } and ] in a string", "meta": {"jobs": [1, 2], "x": {"y": "}"}}},
+    {"id": 3, "title": "escapes \\ \\\" \n \t é ☃", "empty": {}},
+    {"id": 4, "nested": [{"jobs": [{"id": "inner"}]}, []], "note": "\\"},
+]
+DOC = {"meta": {"jobs": "not the array", "list": [{"jobs": []}]}, "jobs": JOBS, "links": {"next": "p2"}}
+BODY = orjson.dumps(DOC)
+PRETTY = orjson.dumps(DOC, option=orjson.OPT_INDENT_2)
+
+
+def stream(body: bytes, size: int) -> tuple[list[dict], dict, ArrayStream]:
+    s = ArrayStream("jobs")
+    items = []
+    for i in range(0, len(body), size):
+        items.extend(s.feed(body[i:i + size]))
+    return items, s.close(), s
+
+
+@pytest.mark.parametrize("body", [BODY, PRETTY])
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+def test_chunk_sizes(body, size):
+    items, rest, s = stream(body, size)
+    assert s.found
+    assert items == JOBS
+    assert rest == {**DOC, "jobs": []}
+
+
+@pytest.mark.parametrize("body", [BODY, PRETTY])
+def test_every_split_point(body):
+    # Covers boundaries inside strings, between a backslash and what it
+    # escapes, and between a closing brace and its separator
+    for cut in range(1, len(body)):
+        s = ArrayStream("jobs")
+        items = s.feed(body[:cut]) + s.feed(body[cut:])
+        assert items == JOBS, cut
+        assert s.close()["links"] == {"next": "p2"}
+
+
+def test_elements_arrive_as_they_complete():
+    s = ArrayStream("jobs")
+    first = orjson.dumps(JOBS[0])
+    head = b'{"jobs": [' + first
+    assert s.feed(head) == []  # closing brace may still be inside a string
+    assert s.feed(b",") == [JOBS[0]]
+    assert s.feed(orjson.dumps(JOBS[1]) + b"]}") == [JOBS[1]]
+    assert s.close() == {"jobs": []}
+
+
+def test_key_only_matches_top_level_array():
+    body = orjson.dumps({"data": {"jobs": [{"id": "nested"}]}, "results": [{"jobs": [{"id": 0}]}]})
+    items, rest, s = stream(body, 5)
+    assert not s.found
+    assert items == []
+    assert rest == orjson.loads(body)
+
+
+def test_key_inside_string_is_ignored():
+    body = b'{"title": "\\"jobs\\": [", "jobs": [{"id": 1}]}'
+    items, rest, s = stream(body, 4)
+    assert items == [{"id": 1}]
+    assert rest == {"title": '"jobs": [', "jobs": []}
+
+
+def test_empty_array():
+    items, rest, s = stream(b'{"jobs": [], "total": 0}', 3)
+    assert s.found and items == [] and rest == {"jobs": [], "total": 0}
+
+
+def test_non_object_element():
+    with pytest.raises(ValueError):
+        ArrayStream("jobs").feed(b'{"jobs": [1, 2]}')
+
+
+@pytest.mark.parametrize("body", [
+    b'{"jo',
+    b'{"jobs": [{"id": 1, "title": "half a str',
+    b'{"jobs": [{"id": 1}, {"id"',
+    b'{"jobs": [{"id": 1}]',
+    BODY[:-1],
+])
+def test_truncated_payload(body):
+    s = ArrayStream("jobs")
+    s.feed(body)
+    with pytest.raises(ValueError):
+        s.close()
@@ -1,5 +1,7 @@
 import re
 import math
+import html
+import time
 from datetime import datetime, timezone
 from urllib.parse import quote
 
@@ -15,15 +17,25 @@ def parse_salary_min(s: str) -> int:
     return int(m[0].replace(",", "")) if m else 0
 
 
-def days_ago(d: str) -> int:
-    if not d:
-        return 999
+def parse_timestamp(d: str | int | float | None) -> float | None:
+    """Epoch seconds from an ISO date (naive means UTC) or a unix timestamp."""
+    if d is None or d == "":
+        return None
+    if isinstance(d, (int, float)):
+        return float(d)
     try:
         dt = datetime.fromisoformat(d)
-        diff = datetime.now(timezone.utc) - dt
-        return max(0, diff.days)
-    except Exception:
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def days_since(ts: float | None, now: float | None = None) -> int:
+    if ts is None:
         return 999
+    return max(0, int(((now or time.time()) - ts) // 86400))
 
 
 def fmt_type(t: str) -> str:
@@ -41,3 +53,26 @@ def logo_url(name: str, raw: str = "") -> str:
     if raw and raw.startswith("http"):
         return raw
     return f"https://ui-avatars.com/api/?name={quote(name)}&background=0a66c2&color=fff&size=100&bold=true"
+
+
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def strip_html(s: str) -> str:
+    """``s`` with tags replaced by spaces and entities decoded."""
+    return html.unescape(_TAG_RE.sub(" ", s))
+
+
+def text_snippet(s: str, max_len: int = 140) -> str:
+    """Plain-text preview of an HTML description, cut on a word boundary."""
+    text = " ".join(strip_html(s).split())
+    if len(text) <= max_len:
+        return text
+    return re.sub(r"\s+\S*$", "", text[:max_len]) + "…"
+
+
+def posted_days(job: dict, now: float | None = None) -> int:
+    """Age of a posting in days as of ``now``, falling back to the mapped value."""
+    if job.get("postedAt") is None:
+        return job["postedDays"]
+    return days_since(job["postedAt"], now)
@@ -3,16 +3,23 @@ const BASE = import.meta.env.VITE_API_BASE_URL
   ? `${import.meta.env.VITE_API_BASE_URL}/api`
   : '/api';
 
-export async function fetchJobs({ query = '', categories = [], skills = [], filters = {} }) {
+export async function fetchJobs({ query = '', categories = [], skills = [], filters = {}, limit = null, cursor = null }) {
   const res = await fetch(`${BASE}/jobs`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify({ query, categories, skills, filters }),
+    body: JSON.stringify({ query, categories, skills, filters, limit, cursor }),
   });
   if (!res.ok) throw new Error(`API error: ${res.status}`);
   return res.json();
 }
 
+// List responses omit the description; fetch it when a job is opened
+export async function fetchJobDetails(id) {
+  const res = await fetch(`${BASE}/jobs/${encodeURIComponent(id)}`);
+  if (!res.ok) throw new Error(`API error: ${res.status}`);
+  return res.json();
+}
+
 export async function fetchCategories() {
   const res = await fetch(`${BASE}/categories`);
   if (!res.ok) throw new Error(`API error: ${res.status}`);
@@ -1,11 +1,28 @@
-import { useEffect } from 'react';
+import { useEffect, useState } from 'react';
 import DOMPurify from 'dompurify';
 import { useApp } from '../../context/AppContext';
+import { fetchJobDetails } from '../../api/jobsApi';
 import { logoUrl } from '../../constants';
 
 export default function JobDetailsModal({ onSkip, onSave }) {
   const { state, dispatch, showToast } = useApp();
-  const job = state.modalJob;
+  const summary = state.modalJob;
+  const [details, setDetails] = useState(null);
+
+  useEffect(() => {
+    setDetails(null);
+    if (!summary || summary.description !== undefined) return;
+    let cancelled = false;
+    fetchJobDetails(summary.id)
+      .then(d => { if (!cancelled) setDetails(d); })
+      .catch(() => {});
+    return () => { cancelled = true; };
+  }, [summary]);
+
+  // Keep the per-user match fields from the list; details add the description
+  const job = summary && details?.id === summary.id
+    ? { ...details, match: summary.match, userSkillMatch: summary.userSkillMatch }
+    : summary;
 
   useEffect(() => {
     const handler = (e) => { if (e.key === 'Escape' && job) dispatch({ type: 'CLOSE_MODAL' }); };
@@ -16,9 +33,10 @@ export default function JobDetailsModal({ onSkip, onSave }) {
   if (!job) return null;
 
   const close = () => dispatch({ type: 'CLOSE_MODAL' });
+  const rawDesc = job.description ?? job.snippet ?? '';
   const desc = job.isHtml
-    ? DOMPurify.sanitize(job.description)
-    : job.description.replace(/\n\n/g, '<br><br>').replace(/### (.*)/g, '<h3>$1</h3>');
+    ? DOMPurify.sanitize(rawDesc)
+    : rawDesc.replace(/\n\n/g, '<br><br>').replace(/### (.*)/g, '<h3>$1</h3>');
 
   return (
     <div className={`modal ${job ? 'active' : ''}`}>
@@ -90,8 +90,8 @@ export default function JobCard({ job, isTop, depth, onSwipe, onOpenDetails, onD
           {job.locationType === 'remote' && <span className="meta-tag remote"><i className="fas fa-wifi"></i> Remote</span>}
           <span className="meta-tag job-type-tag"><i className="fas fa-briefcase"></i> {job.jobType}</span>
         </div>
-        {job.description && (
-          <p className="job-description-snippet">{stripHtmlAndTruncate(job.description, 140)}</p>
+        {(job.snippet || job.description) && (
+          <p className="job-description-snippet">{job.snippet || stripHtmlAndTruncate(job.description, 140)}</p>
         )}
         <div className="skills-container">
           <div className="skills-label">Skills & Match</div>
@@ -37,7 +37,7 @@ const StackView = forwardRef(function StackView(_, ref) {
     });
     if (data) {
       setFilteredJobs(applyFilter(data.jobs || [], activeFilter));
-      if (query) showToast(`Found ${(data.jobs || []).length} jobs for "${query}"`, 'default');
+      if (query) showToast(`Found ${data.total ?? (data.jobs || []).length} jobs for "${query}"`, 'default');
     }
   }, [state.preferences, activeFilter, loadJobs, applyFilter, showToast]);
 
@@ -1,26 +1,50 @@
-import { useState, useCallback } from 'react';
+import { useState, useCallback, useRef } from 'react';
 import { fetchJobs } from '../api/jobsApi';
 
+// First page is shown as soon as it arrives; the rest stream in behind it
+// in the largest pages the API serves (MAX_PAGE_SIZE in backend/config.py)
+const PAGE_SIZE = 25;
+const BACKGROUND_PAGE_SIZE = 100;
+
 export function useJobs() {
   const [jobs, setJobs] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  const latestRequest = useRef(0);
+
+  const loadRemaining = useCallback(async (params, cursor, requestId) => {
+    while (cursor && requestId === latestRequest.current) {
+      try {
+        const page = await fetchJobs({ ...params, limit: BACKGROUND_PAGE_SIZE, cursor });
+        if (requestId !== latestRequest.current) return;
+        setJobs(prev => [...prev, ...(page.jobs || [])]);
+        cursor = page.nextCursor;
+      } catch {
+        return;
+      }
+    }
+  }, []);
 
   const loadJobs = useCallback(async ({ query = '', categories = [], skills = [], filters = {} } = {}) => {
+    const requestId = ++latestRequest.current;
+    const params = { query, categories, skills, filters };
     setLoading(true);
     setError(null);
     try {
-      const data = await fetchJobs({ query, categories, skills, filters });
+      const data = await fetchJobs({ ...params, limit: PAGE_SIZE });
+      if (requestId !== latestRequest.current) return null;
       setJobs(data.jobs || []);
+      loadRemaining(params, data.nextCursor, requestId);
       return data;
     } catch (e) {
+      if (requestId !== latestRequest.current) return null;
       setError(e);
       setJobs([]);
       return null;
     } finally {
-      setLoading(false);
+      if (requestId === latestRequest.current) setLoading(false);
     }
-  }, []);
+  }, [loadRemaining]);
 
   return { jobs, setJobs, loading, error, loadJobs };
 }